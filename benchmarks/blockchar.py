@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of the pure-Python cell analysis kernel, BlockChar.load.
+
+Compares the current kernel with the previous implementation, which allocated new color lists per cell, called
+min/max per byte and counted bits through bin(), on random and on smooth image data, and checks that both produce
+the same characters and colors.
+
+    python benchmarks/blockchar.py --cells 20000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tiv_py"))
+
+from BlockChar import BITMAPS, BlockChar
+
+class LegacyBlockChar:
+    """
+    The kernel as it was before it was tuned, kept as the reference for speed and output.
+    """
+
+    def __init__(self):
+        self.min = [255, 255, 255]
+        self.max = [0, 0, 0]
+        self.bg_color = [0, 0, 0]
+        self.fg_color = [0, 0, 0]
+        self.character = ' '
+
+    def bit_count(self, n: int):
+        return bin(n).count("1")
+
+    def load(self, data: bytearray, p0: int, scan_width: int):
+        self.min = [255, 255, 255]
+        self.max = [0, 0, 0]
+        self.bg_color = [0, 0, 0]
+        self.fg_color = [0, 0, 0]
+
+        pos = p0
+        for y in range(8):
+            for x in range(4):
+                for i in range(3):
+                    d = data[pos] & 255
+                    self.min[i] = min(self.min[i], d)
+                    self.max[i] = max(self.max[i], d)
+                    pos += 1
+                pos += 1  # Alpha
+            pos += scan_width - 16
+
+        splitIndex = 0
+        best_split = 0
+        for i in range(3):
+            if self.max[i] - self.min[i] > best_split:
+                best_split = self.max[i] - self.min[i]
+                splitIndex = i
+        split_value = self.min[splitIndex] + best_split // 2
+
+        bits = 0
+        fg_count = 0
+        bg_count = 0
+        pos = p0
+        for y in range(8):
+            for x in range(4):
+                bits <<= 1
+                if (data[pos + splitIndex] & 255) > split_value:
+                    avg = self.fg_color
+                    bits |= 1
+                    fg_count += 1
+                else:
+                    avg = self.bg_color
+                    bg_count += 1
+                for i in range(3):
+                    avg[i] += data[pos] & 255
+                    pos += 1
+                pos += 1  # Alpha
+            pos += scan_width - 16
+
+        for i in range(3):
+            if bg_count:
+                self.bg_color[i] //= bg_count
+            if fg_count:
+                self.fg_color[i] //= fg_count
+
+        best_diff = float("inf")
+        invert = False
+        for i in range(0, len(BITMAPS), 2):
+            diff = self.bit_count(BITMAPS[i] ^ bits)
+            if diff < best_diff:
+                self.character = BITMAPS[i + 1]
+                best_diff = diff
+                invert = False
+            diff = self.bit_count(~BITMAPS[i] & 0xFFFFFFFF ^ bits)
+            if diff < best_diff:
+                self.character = BITMAPS[i + 1]
+                best_diff = diff
+                invert = True
+
+        if best_diff > 10:
+            invert = False
+            shades = " \u2591\u2592\u2593\u2588"
+            self.character = shades[min(4, fg_count * 5 // 32)]
+
+        if invert:
+            self.bg_color, self.fg_color = self.fg_color, self.bg_color
+
+def make_data(cells: int, smooth: bool, seed: int) -> tuple[bytearray, int]:
+    """
+    Returns RGBX data one cell high and cells cells wide, and its scan width.
+    """
+    rng = random.Random(seed)
+    width = cells * 4
+    if smooth:
+        row = bytearray()
+        for x in range(width):
+            row += bytes((x * 255 // width, (x * 7) & 255, 128, 0))
+        data = bytearray(b for y in range(8) for b in row)
+    else:
+        data = bytearray(rng.randrange(256) for _ in range(width * 8 * 4))
+    return data, width * 4
+
+def run(kernel, data: bytearray, scan_width: int) -> tuple[float, list]:
+    block_char = kernel()
+    results = []
+    start = time.perf_counter()
+    for p0 in range(0, scan_width, 16):
+        block_char.load(data, p0, scan_width)
+        results.append((block_char.character, tuple(block_char.fg_color), tuple(block_char.bg_color)))
+    return time.perf_counter() - start, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the BlockChar cell analysis kernel")
+    parser.add_argument("--cells", type=int, default=20000, help="Number of 4x8 cells to analyze per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for smooth in (False, True):
+        data, scan_width = make_data(args.cells, smooth, args.seed)
+        legacy = min(run(LegacyBlockChar, data, scan_width)[0] for _ in range(args.repeat))
+        current = min(run(BlockChar, data, scan_width)[0] for _ in range(args.repeat))
+        if run(LegacyBlockChar, data, scan_width)[1] != run(BlockChar, data, scan_width)[1]:
+            sys.exit("BlockChar output differs from the legacy kernel")
+        print(f"{'smooth' if smooth else 'random'}: legacy {args.cells / legacy:,.0f} cells/s, "
+              f"current {args.cells / current:,.0f} cells/s, speedup {legacy / current:.2f}x")
+
+if __name__ == "__main__":
+    main()
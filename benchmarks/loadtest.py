@@ -0,0 +1,231 @@
+"""
+End-to-end load test of `python -m tiv_py --stdin`.
+
+Generates a synthetic corpus of JPEG, PNG and GIF images from tiny to --max_megapixels, serves a share of it from a
+local HTTP server and feeds the file paths and URLs to tiv's main() through stdin, as a batch job would. Reports
+images/sec, per-image latency percentiles, peak RSS and output bytes, and writes the results as JSON so runs can be
+compared over time.
+
+    python benchmarks/loadtest.py --count 60 --output loadtest.json -- --mode 24bit
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import resource
+import threading
+import subprocess
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.join(ROOT, "tiv_py")
+
+# Image sizes of the corpus in megapixels, from thumbnail to large camera image.
+MEGAPIXELS = [0.001, 0.05, 0.3, 2, 12, 24, 50]
+FORMATS = ["JPEG", "PNG", "GIF"]
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif"}
+
+# GIF encoding of very large images is slow and unrealistic, larger GIFs are written as JPEG.
+MAX_GIF_MEGAPIXELS = 2
+
+def make_image(path: str, width: int, height: int, image_format: str, seed: int):
+    """
+    Writes a synthetic image with gradients, noise and flat areas, so it neither compresses trivially nor is pure noise.
+    """
+    rng = random.Random(seed)
+    red = Image.linear_gradient("L").rotate(rng.randrange(360)).resize((width, height))
+    green = Image.radial_gradient("L").resize((width, height))
+    blue = Image.effect_noise((max(1, width // 8), max(1, height // 8)), 64).resize((width, height))
+    image = Image.merge("RGB", (red, green, blue))
+    if image_format == "GIF":
+        image = image.quantize(256)
+    image.save(path, image_format)
+
+def generate_corpus(directory: str, count: int, max_megapixels: float, seed: int) -> list[str]:
+    """
+    Generates count images in directory in a pool of worker processes, reusing files from an earlier run with the same parameters.
+    """
+    rng = random.Random(seed)
+    sizes = [mp for mp in MEGAPIXELS if mp <= max_megapixels]
+    specs = []
+    for i in range(count):
+        megapixels = sizes[i % len(sizes)]
+        image_format = FORMATS[rng.randrange(len(FORMATS))]
+        if image_format == "GIF" and megapixels > MAX_GIF_MEGAPIXELS:
+            image_format = "JPEG"
+        aspect = rng.choice([1.0, 4 / 3, 3 / 2, 16 / 9, 9 / 16])
+        height = max(1, round((megapixels * 1e6 / aspect) ** 0.5))
+        width = max(1, round(height * aspect))
+        name = f"{i:04d}_{width}x{height}.{EXTENSIONS[image_format]}"
+        specs.append((os.path.join(directory, name), width, height, image_format, seed + i))
+
+    os.makedirs(directory, exist_ok=True)
+    missing = [spec for spec in specs if not os.path.exists(spec[0])]
+    with ProcessPoolExecutor() as executor:
+        for future in [executor.submit(make_image, *spec) for spec in missing]:
+            future.result()
+    return [spec[0] for spec in specs]
+
+def serve(directory: str) -> ThreadingHTTPServer:
+    """
+    Serves directory on an ephemeral localhost port from a background thread.
+    """
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class CountingSink(io.RawIOBase):
+    """
+    Binary stream that discards everything written to it and counts the bytes.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.count += len(data)
+        return len(data)
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+def peak_rss_bytes() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run(sources: list[str], tiv_args: list[str]) -> dict:
+    """
+    Drives tiv's main() with the sources on stdin and times every convert call.
+    """
+    sys.path.insert(0, PACKAGE)
+    spec = importlib.util.spec_from_file_location("tiv_main", os.path.join(PACKAGE, "__main__.py"))
+    tiv_main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tiv_main)
+
+    latencies = []
+    errors = []
+    convert = tiv_main.convert
+
+    def timed_convert(name, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            convert(name, *args, **kwargs)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+        latencies.append(time.perf_counter() - start)
+
+    tiv_main.convert = timed_convert
+
+    sink = CountingSink()
+    saved = sys.argv, sys.stdin, sys.stdout
+    sys.argv = ["tiv", "--stdin"] + tiv_args
+    sys.stdin = io.StringIO("".join(source + "\n" for source in sources))
+    sys.stdout = io.TextIOWrapper(sink, encoding="utf-8", write_through=True)
+    start = time.perf_counter()
+    try:
+        tiv_main.main()
+        sys.stdout.flush()
+    finally:
+        sys.argv, sys.stdin, sys.stdout = saved
+    elapsed = time.perf_counter() - start
+
+    return {
+        "images": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "images_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+        } if latencies else {},
+        "peak_rss_bytes": peak_rss_bytes(),
+        "output_bytes": sink.count,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test of tiv's --stdin batch mode.")
+    parser.add_argument("--count", type=int, default=40, help="Number of images in the corpus. Default is 40.")
+    parser.add_argument("--max_megapixels", type=float, default=50, help="Size of the largest images. Default is 50.")
+    parser.add_argument("--url_fraction", type=float, default=0.5, help="Share of the images loaded over HTTP. Default is 0.5.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the corpus and of the order of the sources.")
+    parser.add_argument("--corpus", default=os.path.join(ROOT, ".loadtest-corpus"), help="Directory the corpus is generated in and reused from.")
+    parser.add_argument("--output", help="File the JSON results are written to. Default is standard output.")
+    parser.add_argument("tiv_args", nargs="*", help="Additional arguments for tiv, after --.")
+    args = parser.parse_args()
+
+    # Corpus generation runs in worker processes, so it does not count towards the peak RSS measured below
+    files = generate_corpus(args.corpus, args.count, args.max_megapixels, args.seed)
+
+    # The local server must not be reached through a proxy
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1"
+    server = serve(args.corpus)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    rng = random.Random(args.seed)
+    sources = [base_url + os.path.basename(name) if rng.random() < args.url_fraction else name for name in files]
+    rng.shuffle(sources)
+
+    try:
+        results = run(sources, args.tiv_args)
+    finally:
+        server.shutdown()
+
+    results.update({
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "count": args.count,
+            "max_megapixels": args.max_megapixels,
+            "url_fraction": args.url_fraction,
+            "seed": args.seed,
+            "tiv_args": args.tiv_args,
+        },
+    })
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    latency = results["latency_ms"]
+    print(f"{results['images']} images in {results['seconds']:.2f}s, {results['images_per_sec']:.2f} images/sec, "
+          f"p50 {latency.get('p50', 0):.1f}ms p95 {latency.get('p95', 0):.1f}ms p99 {latency.get('p99', 0):.1f}ms, "
+          f"peak RSS {results['peak_rss_bytes'] / 2**20:.0f} MiB, {results['output_bytes']} bytes output, "
+          f"{len(results['errors'])} errors", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
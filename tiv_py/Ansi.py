@@ -3,6 +3,7 @@
 # License: Apache 2.0
 
 import bisect
+from functools import lru_cache
 
 class Ansi:
     """
@@ -11,6 +12,7 @@ class Ansi:
     """
 
     RESET = "\u001b[0m"
+    RESET_BYTES = RESET.encode()
     FG = 1
     BG = 2
     MODE_256 = 4
@@ -20,6 +22,24 @@ class Ansi:
     GRAYSCALE = [0x08, 0x12, 0x1c, 0x26, 0x30, 0x3a, 0x44, 0x4e, 0x58, 0x62, 0x6c, 0x76,
                  0x80, 0x8a, 0x94, 0x9e, 0xa8, 0xb2, 0xbc, 0xc6, 0xd0, 0xda, 0xe4, 0xee]
 
+    # Pre-encoded 256-color escape sequences, indexed by palette index.
+    FG_256 = [f"\u001b[38;5;{i}m".encode() for i in range(256)]
+    BG_256 = [f"\u001b[48;5;{i}m".encode() for i in range(256)]
+
+    @staticmethod
+    def mode_flag(mode) -> int:
+        """
+        Maps an output mode, given either as MODE_256 / MODE_24BIT or as the command line choice '256' / '24bit', to its flag.
+        """
+        return Ansi.MODE_256 if mode in ('256', Ansi.MODE_256) else Ansi.MODE_24BIT
+
+    @staticmethod
+    def move_to(row: int, column: int) -> bytes:
+        """
+        Produces the sequence moving the cursor to a 1-based screen position.
+        """
+        return f"\u001b[{row};{column}H".encode()
+
     @staticmethod
     def best_index(v: int, options: int) -> int:
         index = bisect.bisect_left(options, v)
@@ -49,6 +69,15 @@ class Ansi:
         if (flags & Ansi.MODE_256) == 0:
             return (f"\u001b[48;2;{r};{g};{b}m" if bg else f"\u001b[38;2;{r};{g};{b}m")
         
+        color_index = Ansi.index(r, g, b)
+
+        return (f"\u001B[48;5;{color_index}m" if bg else f"\u001B[38;5;{color_index}m")
+
+    @staticmethod
+    def index(r: int, g: int, b: int) -> int:
+        """
+        Returns the 256-color palette index closest to the given color, picking from the 6x6x6 color cube or the grayscale ramp.
+        """
         r_idx = Ansi.best_index(r, Ansi.COLOR_STEPS)
         g_idx = Ansi.best_index(g, Ansi.COLOR_STEPS)
         b_idx = Ansi.best_index(b, Ansi.COLOR_STEPS)
@@ -64,8 +93,26 @@ class Ansi:
 
         if 0.3 * Ansi.sqr(r_q-r) + 0.59 * Ansi.sqr(g_q-g) + 0.11 *Ansi.sqr(b_q-b) < \
            0.3 * Ansi.sqr(gray_q-r) + 0.59 * Ansi.sqr(gray_q-g) + 0.11 * Ansi.sqr(gray_q-b):
-            color_index = 16 + 36 * r_idx + 6 * g_idx + b_idx
-        else:
-            color_index = 232 + gray_idx  # 1..24 -> 232..255
+            return 16 + 36 * r_idx + 6 * g_idx + b_idx
+        return 232 + gray_idx  # 1..24 -> 232..255
 
-        return (f"\u001B[48;5;{color_index}m" if bg else f"\u001B[38;5;{color_index}m")
+    @staticmethod
+    @lru_cache(maxsize=16384)
+    def color_bytes(flags: int, rgb: int) -> bytes:
+        """
+        Returns the UTF-8 encoded sequence produced by color() for a packed 0xRRGGBB value.
+        Results are interned, so repeated colors cost a single cache lookup.
+        """
+        r = (rgb >> 16) & 255
+        g = (rgb >> 8) & 255
+        b = rgb & 255
+
+        if flags & Ansi.MODE_256:
+            return (Ansi.BG_256 if flags & Ansi.BG else Ansi.FG_256)[Ansi.index(r, g, b)]
+        return Ansi.color(flags, r, g, b).encode()
+
+# Palette index of the gray (v, v, v) for every v, and the pre-encoded sequences for it.
+# Gray cells map to the 232..255 ramp, or to the black and white corners of the color cube, without quantizing three channels.
+Ansi.GRAY_INDEX = [Ansi.index(v, v, v) for v in range(256)]
+Ansi.FG_GRAY_256 = [Ansi.FG_256[i] for i in Ansi.GRAY_INDEX]
+Ansi.BG_GRAY_256 = [Ansi.BG_256[i] for i in Ansi.GRAY_INDEX]
@@ -27,5 +27,16 @@ class TestAnsiClass(unittest.TestCase):
         self.assertEqual(Ansi.color(0, 255, 0, 0), "\u001b[38;2;255;0;0m")
         self.assertEqual(Ansi.color(Ansi.BG, 0, 0, 255), "\u001b[48;2;0;0;255m")
 
+    def test_color_bytes(self):
+        # Test that the pre-encoded sequences match color() in both modes
+        for flags in (Ansi.FG | Ansi.MODE_256, Ansi.BG | Ansi.MODE_256, Ansi.FG | Ansi.MODE_24BIT, Ansi.BG | Ansi.MODE_24BIT):
+            for r, g, b in ((0, 0, 0), (255, 0, 0), (18, 200, 93), (128, 128, 128)):
+                self.assertEqual(Ansi.color_bytes(flags, (r << 16) | (g << 8) | b), Ansi.color(flags, r, g, b).encode())
+
+    def test_gray_tables(self):
+        for v in (0, 8, 100, 238, 255):
+            self.assertEqual(Ansi.FG_GRAY_256[v], Ansi.color(Ansi.FG | Ansi.MODE_256, v, v, v).encode())
+            self.assertEqual(Ansi.BG_GRAY_256[v], Ansi.color(Ansi.BG | Ansi.MODE_256, v, v, v).encode())
+
 if __name__ == '__main__':
     unittest.main()
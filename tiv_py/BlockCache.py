@@ -0,0 +1,51 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import threading
+from typing import Optional
+
+class BlockCache:
+    """
+    Bounded cache of cell analysis results, keyed by the raw pixel bytes of a 4x8 cell.
+    Screenshots, charts and images with flat backgrounds repeat the same cells many times; those are analyzed once.
+    When full, the oldest entries are dropped first.
+    A cache can be shared between threads, lookups and updates are made under a lock.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[tuple[int, int, int]]:
+        """
+        Returns the (code point, foreground, background) result stored for a cell, or None.
+        """
+        with self.lock:
+            cell = self.entries.get(key)
+            if cell is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cell
+
+    def put(self, key: bytes, cell: tuple[int, int, int]):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            if key not in self.entries and len(self.entries) >= self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.entries[key] = cell
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        with self.lock:
+            hits, misses, entries = self.hits, self.misses, len(self.entries)
+        return {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0, "entries": entries}
@@ -0,0 +1,44 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from tiv_py.BlockCache import BlockCache
+
+class TestBlockCache(unittest.TestCase):
+
+    def test_get_put(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get(b'cell'))
+        cache.put(b'cell', (0x2584, 0xff0000, 0x00ff00))
+        self.assertEqual(cache.get(b'cell'), (0x2584, 0xff0000, 0x00ff00))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1})
+
+    def test_shared_between_threads(self):
+        # Threads evicting from a small cache at the same time neither fail nor lose count of lookups
+        cache = BlockCache(max_entries=8)
+
+        def work(thread):
+            for i in range(2000):
+                key = bytes([thread, i % 64])
+                if cache.get(key) is None:
+                    cache.put(key, (i, 0, 0))
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(work, range(8)))
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 2000)
+        self.assertLessEqual(stats['entries'], 8)
+
+    def test_bounded(self):
+        # The oldest entry is dropped when the cache is full
+        cache = BlockCache(max_entries=2)
+        cache.put(b'a', (1, 0, 0))
+        cache.put(b'b', (2, 0, 0))
+        cache.put(b'c', (3, 0, 0))
+        self.assertIsNone(cache.get(b'a'))
+        self.assertEqual(cache.get(b'c'), (3, 0, 0))
+        self.assertEqual(len(cache.entries), 2)
+
+    def test_hit_rate_without_lookups(self):
+        self.assertEqual(BlockCache().hit_rate, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
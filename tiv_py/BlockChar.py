@@ -98,11 +98,20 @@ BITMAPS = [
     # 0x000f7310, '\u25e5'
 ]
 
+# Shading characters used when no bitmap is a good match, from empty to full.
+SHADES = " \u2591\u2592\u2593\u2588"
+
+# UTF-8 encoded form of every character the block analysis can produce, keyed by code point.
+GLYPHS = {ord(character): character.encode("utf-8") for character in BITMAPS[1::2] + list(SHADES)}
+
 class BlockChar:
     """
     Processes 4x8 pixel blocks of an image and finds the best matching block character and its foreground and background colors.
+    An instance is meant to be reused for all blocks of an image: its color lists are preallocated and overwritten by every load, so analyzing a block allocates no objects that outlive it.
     """
 
+    __slots__ = ("min", "max", "bg_color", "fg_color", "character")
+
     def __init__(self):
         self.min = [255, 255, 255]
         self.max = [0, 0, 0]
@@ -111,89 +120,171 @@ class BlockChar:
         self.character = ' '
 
     def bit_count(self, n: int):
-        return bin(n).count("1")
+        return n.bit_count()
 
     def load(self, data: bytearray, p0: int, scan_width: int):
         """
         Computes average colors for the foreground and background of the block, determines which channel (red, green, blue) has the greatest range of values, and generates a bitmap that represents which pixels are above/below the midpoint of that range.
         Then finds the block character from the BITMAPS list that best matches the computed bitmap. If no good match is found, it uses a shading character.
         """
-        
-        self.min = [255, 255, 255]
-        self.max = [0, 0, 0]
-        self.bg_color = [0, 0, 0]
-        self.fg_color = [0, 0, 0]
+        end = p0 + 8 * scan_width
 
-        # Determine the min and max values for each color channel
-        pos = p0
-        for y in range(8):
-            for x in range(4):
-                for i in range(3):
-                    d = data[pos] & 255
-                    self.min[i] = min(self.min[i], d)
-                    self.max[i] = max(self.max[i], d)
-                    pos += 1
-                pos += 1  # Alpha
-            pos += scan_width - 16
+        # Determine the min, max and sum of each color channel in a single pass
+        r_min = g_min = b_min = 255
+        r_max = g_max = b_max = 0
+        r_sum = g_sum = b_sum = 0
+        for row in range(p0, end, scan_width):
+            for pos in range(row, row + 16, 4):
+                r = data[pos]
+                g = data[pos + 1]
+                b = data[pos + 2]
+                if r < r_min:
+                    r_min = r
+                if r > r_max:
+                    r_max = r
+                if g < g_min:
+                    g_min = g
+                if g > g_max:
+                    g_max = g
+                if b < b_min:
+                    b_min = b
+                if b > b_max:
+                    b_max = b
+                r_sum += r
+                g_sum += g
+                b_sum += b
 
         # Determine the color channel with the most significant range
-        splitIndex = 0
-        best_split = 0
-        for i in range(3):
-            if self.max[i] - self.min[i] > best_split:
-                best_split = self.max[i] - self.min[i]
-                splitIndex = i
-        split_value = self.min[splitIndex] + best_split // 2
-
-        # Compute a bitmap using the given split and sum the color values for both buckets
+        split_index = 0
+        best_split = r_max - r_min
+        split_value = r_min + best_split // 2
+        if g_max - g_min > best_split:
+            split_index = 1
+            best_split = g_max - g_min
+            split_value = g_min + best_split // 2
+        if b_max - b_min > best_split:
+            split_index = 2
+            best_split = b_max - b_min
+            split_value = b_min + best_split // 2
+
+        # Compute a bitmap using the given split and sum the color values of the foreground;
+        # the background sums are the remainder of the channel sums
         bits = 0
         fg_count = 0
-        bg_count = 0
-        pos = p0
-        for y in range(8):
-            for x in range(4):
+        fg_r = fg_g = fg_b = 0
+        for row in range(p0, end, scan_width):
+            for pos in range(row, row + 16, 4):
                 bits <<= 1
-                if (data[pos + splitIndex] & 255) > split_value:
-                    avg = self.fg_color
+                if data[pos + split_index] > split_value:
                     bits |= 1
                     fg_count += 1
-                else:
-                    avg = self.bg_color
-                    bg_count += 1
-                for i in range(3):
-                    avg[i] += data[pos] & 255
-                    pos += 1
-                pos += 1  # Alpha
-            pos += scan_width - 16
+                    fg_r += data[pos]
+                    fg_g += data[pos + 1]
+                    fg_b += data[pos + 2]
+
+        self.min[0] = r_min
+        self.min[1] = g_min
+        self.min[2] = b_min
+        self.max[0] = r_max
+        self.max[1] = g_max
+        self.max[2] = b_max
 
         # Calculate the average color value for each bucket
-        for i in range(3):
-            if bg_count:
-                self.bg_color[i] //= bg_count
-            if fg_count:
-                self.fg_color[i] //= fg_count
-
-        # Find the best bitmap match
-        best_diff = float("inf")
+        fg_color = self.fg_color
+        bg_color = self.bg_color
+        if fg_count:
+            fg_color[0] = fg_r // fg_count
+            fg_color[1] = fg_g // fg_count
+            fg_color[2] = fg_b // fg_count
+        else:
+            fg_color[0] = fg_color[1] = fg_color[2] = 0
+        bg_count = 32 - fg_count
+        if bg_count:
+            bg_color[0] = (r_sum - fg_r) // bg_count
+            bg_color[1] = (g_sum - fg_g) // bg_count
+            bg_color[2] = (b_sum - fg_b) // bg_count
+        else:
+            bg_color[0] = bg_color[1] = bg_color[2] = 0
+
+        # Swap colors if we use an inverted character
+        if self.match(bits, fg_count):
+            self.bg_color = fg_color
+            self.fg_color = bg_color
+
+    def load_gray(self, data: bytearray, p0: int, scan_width: int):
+        """
+        Single channel variant of load for grayscale data with one byte per pixel.
+        There is no channel to select, so the bitmap is split at the midpoint of the gray range directly.
+        The resulting colors are gray, with equal red, green and blue components.
+        """
+        end = p0 + 8 * scan_width
+
+        # Determine the min, max and sum of the gray values
+        lo = 255
+        hi = 0
+        total = 0
+        for row in range(p0, end, scan_width):
+            for pos in range(row, row + 4):
+                d = data[pos]
+                if d < lo:
+                    lo = d
+                if d > hi:
+                    hi = d
+                total += d
+        split_value = lo + (hi - lo) // 2
+
+        # Compute a bitmap using the split and sum the gray values of the foreground
+        bits = 0
+        fg_sum = 0
+        fg_count = 0
+        for row in range(p0, end, scan_width):
+            for pos in range(row, row + 4):
+                d = data[pos]
+                bits <<= 1
+                if d > split_value:
+                    bits |= 1
+                    fg_sum += d
+                    fg_count += 1
+
+        # Calculate the average gray value for each bucket
+        fg = fg_sum // fg_count if fg_count else 0
+        bg = (total - fg_sum) // (32 - fg_count) if fg_count < 32 else 0
+
+        # Swap colors if we use an inverted character
+        if self.match(bits, fg_count):
+            fg, bg = bg, fg
+        fg_color = self.fg_color
+        bg_color = self.bg_color
+        fg_color[0] = fg_color[1] = fg_color[2] = fg
+        bg_color[0] = bg_color[1] = bg_color[2] = bg
+
+    def match(self, bits: int, fg_count: int) -> bool:
+        """
+        Sets character to the block character whose bitmap best matches bits, or to a shading character if none matches well.
+        Returns True if the character has to be drawn with foreground and background swapped.
+        """
+        bitmaps = BITMAPS
+        best_diff = 33
+        best = 0
         invert = False
-        for i in range(0, len(BITMAPS), 2):
-            diff = self.bit_count(BITMAPS[i] ^ bits)
+        for i in range(0, len(bitmaps), 2):
+            diff = (bitmaps[i] ^ bits).bit_count()
             if diff < best_diff:
-                self.character = BITMAPS[i + 1]
+                best = i
                 best_diff = diff
                 invert = False
-            diff = self.bit_count(~BITMAPS[i] & 0xFFFFFFFF ^ bits)
+            # The inverted bitmap differs in exactly the other bits
+            diff = 32 - diff
             if diff < best_diff:
-                self.character = BITMAPS[i + 1]
+                best = i
                 best_diff = diff
                 invert = True
+            if not best_diff:
+                break
 
         # Use a shade image if the match is not good
         if best_diff > 10:
-            invert = False
-            shades = " \u2591\u2592\u2593\u2588"
-            self.character = shades[min(4, fg_count * 5 // 32)]
-
-        # Swap colors if we use an inverted character
-        if invert:
-            self.bg_color, self.fg_color = self.fg_color, self.bg_color
\ No newline at end of file
+            self.character = SHADES[min(4, fg_count * 5 // 32)]
+            return False
+        self.character = bitmaps[best + 1]
+        return invert
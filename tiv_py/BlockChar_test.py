@@ -1,4 +1,6 @@
+import random
 import unittest
+import tracemalloc
 from unittest.mock import patch
 from tiv_py.BlockChar import BlockChar, BITMAPS 
 
@@ -26,5 +28,46 @@ class TestBlockChar(unittest.TestCase):
         self.assertEqual(self.block_char.fg_color, [0, 0, 0])
         self.assertEqual(self.block_char.character, 'X')
 
+    def test_load_gray(self):
+        # Top half dark, bottom half light: the same result as the equivalent RGB block
+        gray = bytearray([40] * 16 + [200] * 16)
+        self.block_char.load_gray(gray, 0, 4)
+        self.assertEqual(self.block_char.character, '\u2584')
+        self.assertEqual(self.block_char.fg_color, [200, 200, 200])
+        self.assertEqual(self.block_char.bg_color, [40, 40, 40])
+
+        rgb = BlockChar()
+        rgb.load(bytearray(b for v in gray for b in (v, v, v, 0)), 0, 16)
+        self.assertEqual((rgb.character, rgb.fg_color, rgb.bg_color), (self.block_char.character, self.block_char.fg_color, self.block_char.bg_color))
+
+    def test_load_reuses_buffers(self):
+        random.seed(1)
+        data = bytearray(random.randrange(256) for _ in range(16 * 8 * 32))
+        buffers = {id(self.block_char.min), id(self.block_char.max), id(self.block_char.fg_color), id(self.block_char.bg_color)}
+        for p0 in range(0, 16 * 32, 16):
+            self.block_char.load(data, p0, 16 * 32)
+            self.block_char.load_gray(data, p0, 16 * 32)
+        self.assertEqual({id(self.block_char.min), id(self.block_char.max), id(self.block_char.fg_color), id(self.block_char.bg_color)}, buffers)
+
+    def test_load_allocation_free(self):
+        random.seed(2)
+        data = bytearray(random.randrange(256) for _ in range(16 * 8 * 32))
+        self.block_char.load(data, 0, 16 * 32)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for _ in range(4):
+                for p0 in range(0, 16 * 32, 16):
+                    self.block_char.load(data, p0, 16 * 32)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        # Nothing allocated while analyzing a cell outlives it
+        kernel = [tracemalloc.Filter(True, "*BlockChar.py")]
+        growth = after.filter_traces(kernel).compare_to(before.filter_traces(kernel), "lineno")
+        self.assertEqual(sum(stat.size_diff for stat in growth), 0)
+        self.assertEqual(sum(stat.count_diff for stat in growth), 0)
+
 if __name__ == '__main__':
     unittest.main()
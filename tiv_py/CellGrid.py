@@ -0,0 +1,278 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import sys
+import struct
+from array import array
+from functools import partial
+from typing import Callable, Iterable, Optional
+from Ansi import Ansi
+from BlockCache import BlockCache
+from BlockChar import BlockChar, GLYPHS
+
+# HTML character references for every glyph, keyed by code point like GLYPHS.
+HTML_GLYPHS = {code: f"&#x{code:04x};".encode() for code in GLYPHS}
+
+class CellGrid:
+    """
+    Holds the result of the cell analysis of an image: the block character and the packed 0xRRGGBB foreground and background colors of every 4x8 pixel cell.
+    Grids of grayscale images store a single 0..255 gray value per color instead.
+    The analysis runs once; the serializers then produce ANSI or HTML output from the grid, and the grid can be pickled or stored in a compact binary form for later replay.
+    """
+
+    MAGIC = b"TIVG"
+    HEADER = struct.Struct("<4sIIB")
+
+    # Output formats by name; further serializers taking a CellGrid and returning bytes can be registered here.
+    SERIALIZERS: dict[str, Callable[["CellGrid"], bytes]] = {
+        "ansi256": lambda grid: grid.ansi(Ansi.MODE_256),
+        "ansi24": lambda grid: grid.ansi(Ansi.MODE_24BIT),
+        "html": lambda grid: grid.html(),
+    }
+
+    def __init__(self, width: int, height: int, gray: bool = False):
+        """
+        :param width: Width of the grid in cells.
+        :param height: Height of the grid in cells.
+        :param gray: Whether colors are gray values rather than packed RGB.
+        """
+        self.width = width
+        self.height = height
+        self.gray = gray
+        self.chars = array('I', [0]) * (width * height)
+        self.fg = array('I', [0]) * (width * height)
+        self.bg = array('I', [0]) * (width * height)
+
+    @staticmethod
+    def from_image_data(image_data, cache: Optional[BlockCache] = None) -> "CellGrid":
+        """
+        Runs the block analysis on every complete 4x8 pixel cell of an ImageData, using the single channel analysis for grayscale data.
+        Identical cells are analyzed only once, with results kept in cache, or in a new BlockCache for this image if None.
+        """
+        grid = CellGrid(image_data.width // 4, image_data.height // 8, image_data.channels == 1)
+        grid.analyze(image_data, range(grid.width * grid.height), cache)
+        return grid
+
+    def analyze(self, image_data, cells: Iterable[int], cache: Optional[BlockCache] = None):
+        """
+        Runs the block analysis on the cells with the given indices.
+        """
+        if cache is None:
+            cache = BlockCache()
+        gray = self.gray
+        block_char = BlockChar()
+        load = block_char.load_gray if gray else block_char.load
+        data = image_data.data
+        cell_width = 4 * image_data.channels
+        scan_width = image_data.width * image_data.channels
+        width = self.width
+        chars = self.chars
+        fg = self.fg
+        bg = self.bg
+
+        for i in cells:
+            y, x = divmod(i, width)
+            pos = y * 8 * scan_width + x * cell_width
+
+            # The raw bytes of the cell's eight pixel rows
+            key = b"".join([data[p:p + cell_width] for p in range(pos, pos + 8 * scan_width, scan_width)])
+            cell = cache.get(key)
+            if cell is None:
+                load(data, pos, scan_width)
+                fg_color = block_char.fg_color
+                bg_color = block_char.bg_color
+                if gray:
+                    cell = (ord(block_char.character), fg_color[0], bg_color[0])
+                else:
+                    cell = (ord(block_char.character),
+                            (fg_color[0] << 16) | (fg_color[1] << 8) | fg_color[2],
+                            (bg_color[0] << 16) | (bg_color[1] << 8) | bg_color[2])
+                cache.put(key, cell)
+            chars[i], fg[i], bg[i] = cell
+
+    def changed_cells(self, image_data, previous: bytes) -> list[int]:
+        """
+        Returns the indices of the cells whose pixels differ between previous and the data of image_data, which must have the same size.
+        """
+        cell_width = 4 * image_data.channels
+        scan_width = image_data.width * image_data.channels
+        band = 8 * scan_width
+        data = image_data.data
+        cells = []
+        for y in range(self.height):
+            start = y * band
+
+            # Most bands of eight pixel rows are usually unchanged
+            if data[start:start + band] == previous[start:start + band]:
+                continue
+            for x in range(self.width):
+                pos = start + x * cell_width
+                for p in range(pos, pos + band, scan_width):
+                    if data[p:p + cell_width] != previous[p:p + cell_width]:
+                        cells.append(y * self.width + x)
+                        break
+        return cells
+
+    def update(self, image_data, previous: bytes, cache: Optional[BlockCache] = None) -> list[int]:
+        """
+        Re-analyzes only the cells that changed since previous, the data of an image of the same size the grid was computed from.
+        Returns the indices of the changed cells.
+        """
+        cells = self.changed_cells(image_data, previous)
+        self.analyze(image_data, cells, cache)
+        return cells
+
+    def color_lookup(self, flags: int) -> Callable[[int], bytes]:
+        """
+        Returns a function mapping a stored color to its pre-encoded escape sequence.
+        """
+        if not self.gray:
+            return partial(Ansi.color_bytes, flags)
+        if flags & Ansi.MODE_256:
+            return (Ansi.BG_GRAY_256 if flags & Ansi.BG else Ansi.FG_GRAY_256).__getitem__
+        return lambda v: Ansi.color_bytes(flags, v * 0x010101)
+
+    def rgb(self, color: int) -> int:
+        """
+        Returns a stored color as packed 0xRRGGBB.
+        """
+        return color * 0x010101 if self.gray else color
+
+    def ansi_row(self, y: int, mode) -> bytes:
+        """
+        Serializes one row of cells as ANSI escape sequences and glyphs, without the trailing reset.
+        """
+        mode_flag = Ansi.mode_flag(mode)
+        fg_color = self.color_lookup(Ansi.FG | mode_flag)
+        bg_color = self.color_lookup(Ansi.BG | mode_flag)
+        output = bytearray()
+
+        last_fg = b""
+        last_bg = b""
+        for i in range(y * self.width, (y + 1) * self.width):
+            fg = fg_color(self.fg[i])
+            bg = bg_color(self.bg[i])
+            if fg != last_fg:
+                output += fg
+                last_fg = fg
+            if bg != last_bg:
+                output += bg
+                last_bg = bg
+            output += GLYPHS[self.chars[i]]
+        return bytes(output)
+
+    def ansi_cells(self, cells: Iterable[int], mode) -> bytes:
+        """
+        Serializes the given cells, in ascending order, with cursor positioning, to redraw them over a grid drawn from the top left corner of the screen.
+        Runs of adjacent cells on one row share a single cursor movement.
+        """
+        mode_flag = Ansi.mode_flag(mode)
+        fg_color = self.color_lookup(Ansi.FG | mode_flag)
+        bg_color = self.color_lookup(Ansi.BG | mode_flag)
+        output = bytearray()
+
+        last_fg = b""
+        last_bg = b""
+        next_cell = -1
+        for i in cells:
+            if i != next_cell or i % self.width == 0:
+                y, x = divmod(i, self.width)
+                output += Ansi.move_to(y + 1, x + 1)
+            fg = fg_color(self.fg[i])
+            bg = bg_color(self.bg[i])
+            if fg != last_fg:
+                output += fg
+                last_fg = fg
+            if bg != last_bg:
+                output += bg
+                last_bg = bg
+            output += GLYPHS[self.chars[i]]
+            next_cell = i + 1
+        if output:
+            output += Ansi.RESET_BYTES
+        return bytes(output)
+
+    def ansi(self, mode) -> bytes:
+        """
+        Serializes the grid as ANSI escape sequences in 256-color or 24-bit mode.
+        """
+        output = bytearray()
+        for y in range(self.height):
+            output += self.ansi_row(y, mode)
+            output += Ansi.RESET_BYTES + b"\n"
+        return bytes(output)
+
+    def html(self) -> bytes:
+        """
+        Serializes the grid as HTML, one <tt> element per run of cells with the same colors.
+        """
+        output = bytearray()
+        i = 0
+        for y in range(self.height):
+            last = -1
+            for x in range(self.width):
+                fg = self.rgb(self.fg[i])
+                bg = self.rgb(self.bg[i])
+                style = (bg << 24) | fg
+                if style != last:
+                    if last >= 0:
+                        output += b"</tt>"
+                    output += f"<tt style='background-color:#{(1 << 24) | bg:06x};color:#{(1 << 24) | fg:06x}'>".encode()
+                    last = style
+                output += HTML_GLYPHS[self.chars[i]]
+                i += 1
+            output += b"</tt><br />\n"
+        return bytes(output)
+
+    def serialize(self, name: str) -> bytes:
+        """
+        Serializes the grid with one of the registered SERIALIZERS.
+        """
+        return CellGrid.SERIALIZERS[name](self)
+
+    def to_bytes(self) -> bytes:
+        """
+        Stores the grid in a compact little-endian binary form that from_bytes reads back.
+        """
+        parts = [CellGrid.HEADER.pack(CellGrid.MAGIC, self.width, self.height, self.gray)]
+        for values in (self.chars, self.fg, self.bg):
+            if sys.byteorder == "big":
+                values = array('I', values)
+                values.byteswap()
+            parts.append(values.tobytes())
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "CellGrid":
+        """
+        Reads a grid stored by to_bytes. Raises a ValueError if data is not a complete, valid grid, before anything is allocated for it.
+        """
+        if len(data) < CellGrid.HEADER.size:
+            raise ValueError("Truncated cell grid")
+        magic, width, height, gray = CellGrid.HEADER.unpack_from(data)
+        if magic != CellGrid.MAGIC:
+            raise ValueError("Not a cell grid")
+
+        # Validate the dimensions against the data before allocating the grid
+        size = width * height * array('I').itemsize
+        offset = CellGrid.HEADER.size
+        if len(data) != offset + 3 * size:
+            raise ValueError("Truncated cell grid")
+
+        grid = CellGrid(width, height, bool(gray))
+        for values in (grid.chars, grid.fg, grid.bg):
+            values[:] = array('I', data[offset:offset + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            offset += size
+
+        if not GLYPHS.keys() >= set(grid.chars):
+            raise ValueError("Invalid character in cell grid")
+        if grid.gray and width * height and max(max(grid.fg), max(grid.bg)) > 255:
+            raise ValueError("Invalid gray value in cell grid")
+        return grid
+
+    def __reduce__(self):
+        # Pickle through the compact binary form
+        return (CellGrid.from_bytes, (self.to_bytes(),))
@@ -0,0 +1,116 @@
+import pickle
+import struct
+import unittest
+from tiv_py.BlockCache import BlockCache
+from tiv_py.CellGrid import CellGrid
+from tiv_py.ImageData import ImageData
+
+class TestCellGrid(unittest.TestCase):
+
+    def setUp(self):
+        # An 8x8 image, top half red (255, 0, 0) and bottom half green (0, 255, 0), is a single row of two cells
+        self.image_data = ImageData(8, 8)
+        for i in range(32):
+            self.image_data.data[i * 4:(i + 1) * 4] = bytearray([255, 0, 0, 0])
+        for i in range(32, 64):
+            self.image_data.data[i * 4:(i + 1) * 4] = bytearray([0, 255, 0, 0])
+        self.grid = CellGrid.from_image_data(self.image_data)
+
+    def test_from_image_data(self):
+        self.assertEqual((self.grid.width, self.grid.height), (2, 1))
+        self.assertEqual(list(self.grid.chars), [0x2584, 0x2584])
+        self.assertEqual(list(self.grid.fg), [0x00ff00, 0x00ff00])
+        self.assertEqual(list(self.grid.bg), [0xff0000, 0xff0000])
+
+    def test_cache(self):
+        # Both red cells are identical, so are both green ones; a 16x16 image has two distinct cells
+        image_data = ImageData(16, 16)
+        for i in range(256):
+            image_data.data[i * 4:(i + 1) * 4] = bytearray([255, 0, 0, 0] if i % 16 < 8 else [0, 255, 0, 0])
+        cache = BlockCache()
+        grid = CellGrid.from_image_data(image_data, cache)
+        self.assertEqual(cache.stats(), {'hits': 6, 'misses': 2, 'hit_rate': 0.75, 'entries': 2})
+
+        uncached = CellGrid.from_image_data(image_data, BlockCache(max_entries=0))
+        self.assertEqual(grid.to_bytes(), uncached.to_bytes())
+
+    def test_update(self):
+        grid = CellGrid.from_image_data(self.image_data)
+        previous = bytes(self.image_data.data)
+
+        # Turn the right cell blue; only that cell is analyzed and redrawn
+        for y in range(8):
+            self.image_data.data[y * 32 + 16:y * 32 + 32] = bytearray([0, 0, 255, 0] * 4)
+        self.assertEqual(grid.update(self.image_data, previous), [1])
+        self.assertEqual(grid.to_bytes(), CellGrid.from_image_data(self.image_data).to_bytes())
+        self.assertEqual(grid.update(self.image_data, bytes(self.image_data.data)), [])
+
+        self.assertEqual(grid.ansi_cells([1], '256'), b'\x1b[1;2H\x1b[38;5;16m\x1b[48;5;21m\xc2\xa0\x1b[0m')
+        self.assertEqual(grid.ansi_cells([], '256'), b'')
+
+    def test_ansi_cells_runs(self):
+        # Adjacent cells share one cursor movement, a new row or a gap needs another
+        grid = CellGrid(3, 2)
+        grid.chars[:] = CellGrid.from_image_data(ImageData(12, 16)).chars
+        output = grid.ansi_cells([0, 1, 2, 3, 5], '24bit')
+        self.assertEqual(output.count(b'H'), 3)
+        self.assertIn(b'\x1b[1;1H', output)
+        self.assertIn(b'\x1b[2;1H', output)
+        self.assertIn(b'\x1b[2;3H', output)
+
+    def test_ansi(self):
+        self.assertEqual(self.grid.ansi('256'), b'\x1b[38;5;46m\x1b[48;5;196m' + '▄▄'.encode() + b'\x1b[0m\n')
+        self.assertEqual(self.grid.ansi('24bit'), b'\x1b[38;2;0;255;0m\x1b[48;2;255;0;0m' + '▄▄'.encode() + b'\x1b[0m\n')
+
+    def test_html(self):
+        self.assertEqual(self.grid.html(), b"<tt style='background-color:#1ff0000;color:#100ff00'>&#x2584;&#x2584;</tt><br />\n")
+
+    def test_serializers_match_dump(self):
+        self.assertEqual(self.grid.serialize('ansi256'), self.image_data.dump('256', html=False))
+        self.assertEqual(self.grid.serialize('ansi24'), self.image_data.dump('24bit', html=False))
+        self.assertEqual(self.grid.serialize('html'), self.image_data.dump('256', html=True))
+
+    def test_binary_round_trip(self):
+        data = self.grid.to_bytes()
+        self.assertEqual(len(data), CellGrid.HEADER.size + 3 * 2 * 4)
+        restored = CellGrid.from_bytes(data)
+        self.assertEqual(restored.ansi('256'), self.grid.ansi('256'))
+
+        with self.assertRaises(ValueError):
+            CellGrid.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            CellGrid.from_bytes(b'XXXX' + data[4:])
+
+    def test_from_bytes_invalid(self):
+        # A short buffer, and a header claiming a huge grid that is rejected before anything is allocated
+        with self.assertRaises(ValueError):
+            CellGrid.from_bytes(b'TIVG')
+        with self.assertRaises(ValueError):
+            CellGrid.from_bytes(struct.pack('<4sIIB', b'TIVG', 50000, 50000, 0))
+
+        # A code point that is not a glyph
+        data = bytearray(self.grid.to_bytes())
+        data[CellGrid.HEADER.size:CellGrid.HEADER.size + 4] = struct.pack('<I', 0x1b)
+        with self.assertRaises(ValueError):
+            CellGrid.from_bytes(bytes(data))
+
+    def test_gray(self):
+        image_data = ImageData(4, 8, 1)
+        image_data.data[:] = bytearray([40] * 16 + [200] * 16)
+        grid = CellGrid.from_image_data(image_data)
+        self.assertTrue(grid.gray)
+        self.assertEqual(list(grid.fg), [200])
+        self.assertEqual(list(grid.bg), [40])
+        self.assertEqual(grid.ansi('24bit'), b'\x1b[38;2;200;200;200m\x1b[48;2;40;40;40m' + '▄'.encode() + b'\x1b[0m\n')
+        self.assertIn(b'background-color:#1282828', grid.html())
+
+        restored = CellGrid.from_bytes(grid.to_bytes())
+        self.assertTrue(restored.gray)
+        self.assertEqual(restored.ansi('256'), grid.ansi('256'))
+
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.grid))
+        self.assertEqual(restored.html(), self.grid.html())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,64 +2,54 @@
 # https://github.com/stefanhaustein/TerminalImageViewer
 # License: Apache 2.0
 
-from Ansi import Ansi
-from BlockChar import BlockChar
+from typing import Optional
+from PIL import Image
+from BlockCache import BlockCache
+from CellGrid import CellGrid
 
 class ImageData:
     """
     Represents the entire image's data and provides the dump method, which converts the image data to colored block characters for terminal or HTML display.
     """
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, channels: int = 4):
+        """
+        :param channels: 4 for RGB data with a padding byte per pixel, or 1 for grayscale data.
+        """
         self.width = width
         self.height = height
-        self.data = bytearray(width * height * 4)
+        self.channels = channels
+        self.data = bytearray(width * height * channels)
+
+    @staticmethod
+    def from_image(image: Image.Image) -> "ImageData":
+        """
+        Copies the pixels of a PIL image into a new ImageData, with one channel for grayscale (mode L) images.
+        """
+        w, h = image.size
+
+        # Grayscale images stay single channel
+        if image.mode == "L":
+            image_data = ImageData(w, h, 1)
+            image_data.data[:] = image.tobytes()
+        else:
+            image_data = ImageData(w, h)
+            image_data.data[:] = image.convert("RGB").tobytes("raw", "RGBX")
+        return image_data
         
     def hex6(self, r: int, g: int, b: int) -> str:
         return f"{(1 << 24) | ((r & 255) << 16) | ((g & 255) << 8) | (b & 255):06x}"
     
-    def dump(self, mode: str, html: bool):
-        output = []
-        block_char = BlockChar()
-        
-        y = 0
-        while y < self.height - 7:
-            pos = y * self.width * 4
-            if html:
-                last = ""
-                x = 0
-                while x < self.width - 3:
-                    block_char.load(self.data, pos, self.width * 4)
-                    fg = self.hex6(block_char.fg_color[0], block_char.fg_color[1], block_char.fg_color[2])
-                    bg = self.hex6(block_char.bg_color[0], block_char.bg_color[1], block_char.bg_color[2])
-                    style = f"background-color:#{bg};color:#{fg}"
-                    if style != last:
-                        if last:
-                            output.append("</tt>")
-                        output.append(f"<tt style='{style}'>")
-                        last = style
-                    output.append(f"&#x{(ord(block_char.character)):04x};")
-                    pos += 16
-                    x += 4
-                output.append("</tt><br />\n")
-            else:
-                last_fg = ""
-                last_bg = ""
-                x = 0
-                while x < self.width - 3:
-                    block_char.load(self.data, pos, self.width * 4)
-                    mode_mask = 4 if mode == '256' else 8
-                    fg = Ansi.color(Ansi.FG | mode_mask, block_char.fg_color[0], block_char.fg_color[1], block_char.fg_color[2])
-                    bg = Ansi.color(Ansi.BG | mode_mask, block_char.bg_color[0], block_char.bg_color[1], block_char.bg_color[2])
-                    if fg != last_fg:
-                        output.append(fg)
-                        last_fg = fg
-                    if bg != last_bg:
-                        output.append(bg)
-                        last_bg = bg
-                    output.append(block_char.character)
-                    pos += 16
-                    x += 4
-                output.append(Ansi.RESET + "\n")
-            y += 8
-        return ''.join(output)
+    def cells(self, cache: Optional[BlockCache] = None) -> CellGrid:
+        """
+        Runs the block analysis, returning a CellGrid that can be serialized to any output format.
+        A BlockCache shared between images of the same kind, e.g. successive screenshots, can be passed as cache, also from several threads; its stats report the hit rate.
+        """
+        return CellGrid.from_image_data(self, cache)
+
+    def dump(self, mode: str, html: bool) -> bytes:
+        """
+        Renders the image as UTF-8 encoded ANSI or HTML output.
+        """
+        grid = self.cells()
+        return grid.html() if html else grid.ansi(mode)
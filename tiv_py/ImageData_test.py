@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch
 from tiv_py.ImageData import ImageData
+from tiv_py.Ansi import Ansi
+from PIL import Image
 
 def hex6(self, r: int, g: int, b: int) -> str:
     # Ensure each component is exactly two hex digits
@@ -21,18 +23,47 @@ class TestImageData(unittest.TestCase):
     def test_dump_html(self):
         # Test HTML output
         html_output = self.image_data.dump('256', html=True)
-        self.assertIn("<tt style='background-color:#1ff0000;color:#100ff00'>", html_output)
-        self.assertIn("&#x2584;", html_output)
-        self.assertIn("</tt><br />\n", html_output)
+        self.assertIn(b"<tt style='background-color:#1ff0000;color:#100ff00'>", html_output)
+        self.assertIn(b"&#x2584;", html_output)
+        self.assertIn(b"</tt><br />\n", html_output)
 
     def test_dump_ansi(self):
         # Test ANSI terminal output
         ansi_output = self.image_data.dump('256', html=False)
         # Since the ANSI output is more complex and may include escape codes, we will just check that it includes the reset code
-        self.assertIn('\x1b[0m', ansi_output)
-        self.assertIn('\x1b[38;5;46m', ansi_output)
-        self.assertIn('▄▄', ansi_output)
-        self.assertIn('\x1b[0m\n', ansi_output)
+        self.assertIn(b'\x1b[0m', ansi_output)
+        self.assertIn(b'\x1b[38;5;46m', ansi_output)
+        self.assertIn('▄▄'.encode(), ansi_output)
+        self.assertIn(b'\x1b[0m\n', ansi_output)
+
+    def test_dump_ansi_24bit(self):
+        # Test true color output, which is selected by anything other than 256-color mode
+        ansi_output = self.image_data.dump('24bit', html=False)
+        self.assertIn(b'\x1b[38;2;0;255;0m', ansi_output)
+        self.assertIn(b'\x1b[48;2;255;0;0m', ansi_output)
+
+    def test_dump_ansi_mode_flag(self):
+        # The numeric mode passed by the command line is equivalent to the string form
+        self.assertEqual(self.image_data.dump(Ansi.MODE_256, html=False), self.image_data.dump('256', html=False))
+
+    def test_from_image(self):
+        image_data = ImageData.from_image(Image.new('RGB', (2, 1), color = (1, 2, 3)))
+        self.assertEqual(image_data.channels, 4)
+        self.assertEqual(image_data.data[:3], bytearray([1, 2, 3]))
+        self.assertEqual(image_data.data[4:7], bytearray([1, 2, 3]))
+
+    def test_from_image_grayscale(self):
+        # Grayscale images keep one byte per pixel
+        image_data = ImageData.from_image(Image.new('L', (2, 1), color = 7))
+        self.assertEqual(image_data.channels, 1)
+        self.assertEqual(image_data.data, bytearray([7, 7]))
+
+    def test_dump_grayscale(self):
+        # The single channel path renders exactly like the same image in RGB
+        image = Image.linear_gradient('L').resize((16, 16))
+        for mode in ('256', '24bit'):
+            for html in (False, True):
+                self.assertEqual(ImageData.from_image(image).dump(mode, html), ImageData.from_image(image.convert('RGB')).dump(mode, html))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,96 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import threading
+from typing import Callable, Optional
+from PIL import Image
+from resize_image import target_size
+
+class ImagePyramid:
+    """
+    Keeps a decoded image together with successively halved copies of it, so that any output size can be resampled from the nearest larger level instead of from the full resolution image.
+    A pyramid can be shared between threads: levels that are loaded lazily are loaded under a lock.
+    """
+
+    # Levels are not reduced below this width or height.
+    MIN_LEVEL_SIZE = 16
+
+    def __init__(self, size: tuple[int, int], reduced: list[Optional[Image.Image]], original: Optional[Image.Image] = None,
+                 load_original: Optional[Callable[[], Image.Image]] = None, level_sizes: Optional[list[tuple[int, int]]] = None,
+                 load_level: Optional[Callable[[int], Image.Image]] = None):
+        """
+        :param size: Size of the full resolution image.
+        :param reduced: Reduced levels, largest first, each half the size of the previous one. Levels that are None are loaded when first needed.
+        :param original: The full resolution image, if already available.
+        :param load_original: Called to obtain the full resolution image the first time it is needed when original is not given.
+        :param level_sizes: Sizes of the reduced levels, required if some of them are None.
+        :param load_level: Called with the index of a reduced level to obtain it the first time it is needed.
+        """
+        self.size = size
+        self.reduced = reduced
+        self.level_sizes = level_sizes if level_sizes is not None else [level.size for level in reduced]
+        self._original = original
+        self.load_original = load_original
+        self.load_level = load_level
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def from_image(original: Image.Image) -> "ImagePyramid":
+        """
+        Builds the pyramid for an image by repeatedly halving it with a box filter.
+        """
+        original.load()
+        level = original if original.mode in ("L", "LA", "RGB", "RGBA") else original.convert("RGBA" if "transparency" in original.info else "RGB")
+        reduced = []
+        while level.width >= 2 * ImagePyramid.MIN_LEVEL_SIZE and level.height >= 2 * ImagePyramid.MIN_LEVEL_SIZE:
+            level = level.reduce(2)
+            reduced.append(level)
+        return ImagePyramid(original.size, reduced, original)
+
+    @property
+    def original(self) -> Image.Image:
+        with self.lock:
+            if self._original is None:
+                original = self.load_original()
+                original.load()
+                self._original = original
+            return self._original
+
+    def level_for(self, width: int, height: int) -> Image.Image:
+        """
+        Returns the smallest level that is at least width x height pixels large.
+        """
+        best = None
+        for i, (level_width, level_height) in enumerate(self.level_sizes):
+            if level_width < width or level_height < height:
+                break
+            best = i
+        if best is None:
+            return self.original
+
+        with self.lock:
+            level = self.reduced[best]
+            if level is None:
+                try:
+                    level = self.reduced[best] = self.load_level(best)
+                except (OSError, SyntaxError, ValueError):
+                    # A damaged level, resample from the full resolution image instead
+                    pass
+        if level is None:
+            level = self.original
+            self.reduced[best] = level
+        return level
+
+    def resize(self, max_width: int, max_height: int, grayscale: bool) -> Image.Image:
+        """
+        Produces the same result as resize_image on the full resolution image, resampling from the nearest larger level.
+        """
+        original_width, original_height = self.size
+        width, height = target_size(original_width, original_height, max_width, max_height)
+
+        if original_width == width and not grayscale:
+            return self.original
+
+        image = self.level_for(width, height).resize((width, height), Image.LANCZOS)
+        return image.convert('L') if grayscale else image
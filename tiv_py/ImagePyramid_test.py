@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import Mock
+from PIL import Image
+from tiv_py.ImagePyramid import ImagePyramid
+
+class TestImagePyramid(unittest.TestCase):
+
+    def setUp(self):
+        # Create a test image
+        self.original = Image.new('RGB', (800, 600), color = 'red')
+        self.pyramid = ImagePyramid.from_image(self.original)
+
+    def test_levels(self):
+        # Each level halves the previous one until the minimum level size is reached
+        self.assertEqual([level.size for level in self.pyramid.reduced], [(400, 300), (200, 150), (100, 75), (50, 38), (25, 19)])
+
+    def test_level_for(self):
+        self.assertEqual(self.pyramid.level_for(320, 192).size, (400, 300))
+        self.assertEqual(self.pyramid.level_for(100, 70).size, (100, 75))
+        self.assertIs(self.pyramid.level_for(500, 300), self.original)
+
+    def test_resize(self):
+        # Sizes match resize_image on the full resolution image
+        self.assertEqual(self.pyramid.resize(320, 192, False).size, (256, 192))
+        self.assertEqual(self.pyramid.resize(1000, 1000, False).size, (1000, 750))
+        self.assertIs(self.pyramid.resize(800, 600, False), self.original)
+        self.assertEqual(self.pyramid.resize(40, 40, False).getpixel((0, 0)), (255, 0, 0))
+
+    def test_resize_grayscale(self):
+        resized = self.pyramid.resize(800, 600, True)
+        self.assertEqual(resized.mode, 'L')
+        self.assertEqual(resized.size, (800, 600))
+
+    def test_palette_image(self):
+        pyramid = ImagePyramid.from_image(Image.new('P', (64, 64)))
+        self.assertEqual(pyramid.reduced[0].mode, 'RGB')
+
+    def test_lazy_original(self):
+        load_original = Mock(return_value=self.original)
+        pyramid = ImagePyramid(self.original.size, self.pyramid.reduced, load_original=load_original)
+
+        pyramid.resize(320, 192, False)
+        load_original.assert_not_called()
+
+        self.assertIs(pyramid.resize(800, 600, False), self.original)
+        load_original.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from PIL import Image
+from ImagePyramid import ImagePyramid
+from is_url import is_url
+from load_image import load_image
+
+class PyramidCache:
+    """
+    Keeps the image pyramids of the most recently used sources in memory and, if a directory is given, their reduced levels on disk.
+    Local files are keyed by path, modification time and size, so a changed file is decoded again.
+    URLs have no such validator and are only kept in memory, so a changed remote image is picked up by the next process.
+    The cache can be shared between threads; sources are decoded outside of its lock, so different sources are decoded concurrently.
+    """
+
+    def __init__(self, max_entries: int = 8, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def key(self, name: str) -> str:
+        if is_url(name):
+            return name
+        stat = os.stat(name)
+        return f"{os.path.abspath(name)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get(self, name: str) -> ImagePyramid:
+        """
+        Returns the pyramid for an image source, decoding the source only if it is neither in memory nor on disk.
+        """
+        key = self.key(name)
+        with self.lock:
+            pyramid = self.entries.get(key)
+            if pyramid is not None:
+                # Most recently used entries are kept at the end
+                self.entries.move_to_end(key)
+                return pyramid
+
+        on_disk = self.directory and not is_url(name)
+        if on_disk:
+            pyramid = self.read(key, name)
+        if pyramid is None:
+            pyramid = ImagePyramid.from_image(load_image(name))
+            if on_disk:
+                self.write(key, pyramid)
+
+        with self.lock:
+            # Another thread may have loaded the same source in the meantime
+            pyramid = self.entries.setdefault(key, pyramid)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return pyramid
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def read(self, key: str, name: str) -> Optional[ImagePyramid]:
+        path = self.path(key)
+        try:
+            with open(os.path.join(path, "pyramid.json")) as f:
+                meta = json.load(f)
+            size = tuple(meta["size"])
+            level_sizes = [tuple(level) for level in meta["levels"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        # The levels are only opened when a size is resampled from them, so no files are held open
+        return ImagePyramid(size, [None] * len(level_sizes), load_original=lambda: load_image(name), level_sizes=level_sizes,
+                            load_level=lambda i: self.read_level(path, i))
+
+    def read_level(self, path: str, i: int) -> Image.Image:
+        try:
+            with Image.open(os.path.join(path, f"{i + 1}.png")) as level:
+                level.load()
+            return level
+        except (OSError, SyntaxError, ValueError):
+            # A damaged entry is dropped, so the next cache reading it decodes the source and writes it again
+            try:
+                os.remove(os.path.join(path, "pyramid.json"))
+            except OSError:
+                pass
+            raise
+
+    def replace(self, path: str, save: Callable[[str], None]):
+        """
+        Writes a file through save under a temporary name and then renames it into place, so readers in other threads or processes never see a partial file.
+        """
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            save(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+    def write(self, key: str, pyramid: ImagePyramid):
+        """
+        Stores the reduced levels of a pyramid. The full resolution level is not stored, it is reloaded from the source when needed.
+        """
+        path = self.path(key)
+        os.makedirs(path, exist_ok=True)
+        for i, level in enumerate(pyramid.reduced):
+            self.replace(os.path.join(path, f"{i + 1}.png"), lambda temporary: level.save(temporary, "PNG"))
+
+        # Written last, so an interrupted write is treated as a cache miss
+        meta = {"size": list(pyramid.size), "levels": [list(level_size) for level_size in pyramid.level_sizes]}
+        def save_meta(temporary: str):
+            with open(temporary, "w") as f:
+                json.dump(meta, f)
+        self.replace(os.path.join(path, "pyramid.json"), save_meta)
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from PIL import Image
+from tiv_py.PyramidCache import PyramidCache
+
+class TestPyramidCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.name = os.path.join(self.directory.name, 'image.png')
+        Image.new('RGB', (128, 64), color = 'blue').save(self.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_cache(self):
+        cache = PyramidCache()
+        pyramid = cache.get(self.name)
+        self.assertIs(cache.get(self.name), pyramid)
+
+    def test_shared_between_threads(self):
+        cache = PyramidCache(directory=os.path.join(self.directory.name, 'cache'))
+        cache.get(self.name)
+
+        # Levels read back from disk are decoded lazily while several threads resize from them
+        cache = PyramidCache(directory=os.path.join(self.directory.name, 'cache'))
+        with ThreadPoolExecutor(8) as executor:
+            sizes = list(executor.map(lambda i: cache.get(self.name).resize(16 + i, 16 + i, False).size, range(32)))
+        self.assertEqual(sizes, [(16 + i, (16 + i) // 2) for i in range(32)])
+
+    def test_eviction(self):
+        other = os.path.join(self.directory.name, 'other.png')
+        Image.new('RGB', (64, 64)).save(other)
+
+        cache = PyramidCache(max_entries=1)
+        pyramid = cache.get(self.name)
+        cache.get(other)
+        self.assertIsNot(cache.get(self.name), pyramid)
+
+    def test_changed_file(self):
+        cache = PyramidCache()
+        pyramid = cache.get(self.name)
+        Image.new('RGB', (100, 50)).save(self.name)
+        os.utime(self.name, ns=(0, 0))
+        self.assertEqual(cache.get(self.name).size, (100, 50))
+        self.assertNotEqual(pyramid.size, (100, 50))
+
+    def test_disk_cache(self):
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        PyramidCache(directory=cache_directory).get(self.name)
+
+        # A new cache reads the reduced levels from disk instead of decoding the source
+        with patch('tiv_py.PyramidCache.load_image', side_effect=AssertionError) as mock_load_image:
+            pyramid = PyramidCache(directory=cache_directory).get(self.name)
+            self.assertEqual(pyramid.size, (128, 64))
+            self.assertEqual(pyramid.resize(32, 32, False).getpixel((0, 0)), (0, 0, 255))
+            mock_load_image.assert_not_called()
+
+    @patch('tiv_py.PyramidCache.load_image')
+    def test_disk_cache_skips_urls(self, mock_load_image):
+        mock_load_image.return_value = Image.new('RGB', (128, 64))
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        PyramidCache(directory=cache_directory).get('http://example.com/image.png')
+        PyramidCache(directory=cache_directory).get('http://example.com/image.png')
+
+        # Without a validator a cached remote image could be stale, so it is downloaded again
+        self.assertEqual(mock_load_image.call_count, 2)
+        self.assertFalse(os.path.exists(cache_directory) and os.listdir(cache_directory))
+
+    def test_disk_cache_damaged_level(self):
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        cache = PyramidCache(directory=cache_directory)
+        cache.get(self.name)
+        level_path = os.path.join(cache.path(cache.key(self.name)), '1.png')
+        with open(level_path, 'wb') as f:
+            f.write(b'garbage')
+
+        # The damaged level is replaced by the source, and the entry is dropped from disk
+        pyramid = PyramidCache(directory=cache_directory).get(self.name)
+        self.assertEqual(pyramid.resize(48, 24, False).getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(pyramid.resize(48, 24, False).size, (48, 24))
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(level_path), 'pyramid.json')))
+
+        # The next cache decodes the source and writes the entry again
+        pyramid = PyramidCache(directory=cache_directory).get(self.name)
+        self.assertEqual(pyramid.resize(48, 24, False).getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(sorted(os.listdir(os.path.dirname(level_path))), ['1.png', '2.png', 'pyramid.json'])
+
+    def test_disk_cache_opens_levels_when_used(self):
+        cache_directory = os.path.join(self.directory.name, 'cache')
+        PyramidCache(directory=cache_directory).get(self.name)
+
+        pyramid = PyramidCache(directory=cache_directory).get(self.name)
+        self.assertEqual(pyramid.level_sizes, [(64, 32), (32, 16)])
+        self.assertEqual(pyramid.reduced, [None, None])
+
+        # Only the level that is resampled from is read, and its file is closed again
+        pyramid.resize(48, 24, False)
+        self.assertIsNotNone(pyramid.reduced[0])
+        self.assertIsNone(pyramid.reduced[1])
+        self.assertIsNone(getattr(pyramid.reduced[0], 'fp', None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,8 @@ import sys
 from parse_args import parse_args
 from Ansi import Ansi
 from convert import convert
+from gallery import gallery
+from watch import watch
 
 def main():
     """
@@ -22,9 +24,13 @@ def main():
             name = line.strip()
             if not name:
                 break
-            convert(name, max_width, max_height, mode, args.html, args.grayscale)
+            convert(name, max_width, max_height, mode, args.html, args.grayscale, full_decode=args.full_decode)
+    elif args.gallery:
+        gallery(args.gallery, args.tile_width, mode, args.grayscale, args.jobs, full_decode=args.full_decode)
+    elif args.watch:
+        watch(args.image_source, max_width, max_height, mode, args.grayscale, args.interval)
     else:
-        convert(args.image_source, max_width, max_height, mode, args.html, args.grayscale)
+        convert(args.image_source, max_width, max_height, mode, args.html, args.grayscale, full_decode=args.full_decode)
 
 if __name__ == "__main__":
     main()
@@ -2,15 +2,19 @@
 # https://github.com/stefanhaustein/TerminalImageViewer
 # License: Apache 2.0
 
+from typing import BinaryIO, Optional
 from load_image import load_image
 from resize_image import resize_image
 from dump import dump
 
-def convert(name: str, max_width: int, max_height: int, mode: str, html: bool, grayscale: bool):
+def convert(name: str, max_width: int, max_height: int, mode: str, html: bool, grayscale: bool, out: Optional[BinaryIO] = None,
+            full_decode: bool = False):
     """
     Resizes an image, if necessary, to fit within a given width and height, and then dumps its colored block character representation to the terminal or as HTML.
+    Nothing is shared between calls, so images can be converted concurrently from several threads, each writing to its own out stream.
+    Unless full_decode is set, an embedded EXIF thumbnail that is large enough is used instead of decoding the full image.
     """
 
-    original = load_image(name)
+    original = load_image(name, max_size=None if full_decode else (max_width, max_height))
     image = resize_image(original, max_width, max_height, grayscale)
-    dump(image, mode, html)
+    dump(image, mode, html, out)
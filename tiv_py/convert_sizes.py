@@ -0,0 +1,18 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+from typing import BinaryIO, Iterable, Optional
+from PyramidCache import PyramidCache
+from dump import dump
+
+def convert_sizes(name: str, sizes: Iterable[tuple[int, int]], mode: str, html: bool, grayscale: bool, cache: Optional[PyramidCache] = None,
+                  out: Optional[BinaryIO] = None):
+    """
+    Dumps an image at each of the given (max_width, max_height) pixel sizes, decoding it only once.
+    Each size is resampled from the nearest larger level of the image's pyramid.
+    """
+
+    pyramid = (cache if cache is not None else PyramidCache()).get(name)
+    for max_width, max_height in sizes:
+        dump(pyramid.resize(max_width, max_height, grayscale), mode, html, out)
@@ -0,0 +1,21 @@
+import unittest
+from unittest.mock import Mock, patch, call
+from tiv_py.convert_sizes import convert_sizes
+
+class TestConvertSizesFunction(unittest.TestCase):
+
+    @patch('tiv_py.convert_sizes.dump')
+    def test_convert_sizes(self, mock_dump):
+        cache = Mock()
+        pyramid = cache.get.return_value
+        pyramid.resize.side_effect = lambda w, h, grayscale: (w, h)
+
+        convert_sizes('image.png', [(64, 64), (320, 192)], '256', False, True, cache)
+
+        # The source is looked up once and every size is resized from its pyramid
+        cache.get.assert_called_once_with('image.png')
+        pyramid.resize.assert_has_calls([call(64, 64, True), call(320, 192, True)])
+        mock_dump.assert_has_calls([call((64, 64), '256', False, None), call((320, 192), '256', False, None)])
+
+if __name__ == '__main__':
+    unittest.main()
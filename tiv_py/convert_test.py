@@ -1,4 +1,9 @@
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image
 from unittest.mock import Mock
 from unittest.mock import patch
 from tiv_py.convert import convert
@@ -29,14 +34,40 @@ class TestConvertFunction(unittest.TestCase):
         convert(test_image_name, max_width, max_height, mode, html, grayscale)
 
         # Assert
-        # Check if load_image was called with the correct filename
-        mock_load_image.assert_called_once_with(test_image_name)
+        # Check if load_image was called with the correct filename and the output size, so it may use an embedded thumbnail
+        mock_load_image.assert_called_once_with(test_image_name, max_size=(max_width, max_height))
 
         # Check if resize_image was called with the correct parameters
         mock_resize_image.assert_called_once_with(original_image_mock, max_width, max_height, grayscale)
 
         # Check if dump was called with the resized image and the correct parameters
-        mock_dump.assert_called_once_with(resized_image_mock, mode, html)
+        mock_dump.assert_called_once_with(resized_image_mock, mode, html, None)
+
+    @patch('tiv_py.convert.load_image')
+    @patch('tiv_py.convert.resize_image')
+    @patch('tiv_py.convert.dump')
+    def test_convert_full_decode(self, mock_dump, mock_resize_image, mock_load_image):
+        convert('test_image.jpg', 80, 60, '256', False, False, full_decode=True)
+        mock_load_image.assert_called_once_with('test_image.jpg', max_size=None)
+
+    def test_convert_concurrently(self):
+        # Concurrent conversions writing to their own streams produce the same output as serial ones
+        with tempfile.TemporaryDirectory() as directory:
+            names = []
+            for i in range(4):
+                name = os.path.join(directory, f'{i}.png')
+                Image.linear_gradient('L').rotate(i * 45).convert('RGB').save(name)
+                names.append(name)
+
+            def render(name, grayscale):
+                out = BytesIO()
+                convert(name, 32, 32, '256', False, grayscale, out)
+                return out.getvalue()
+
+            jobs = [(name, grayscale) for name in names for grayscale in (False, True)] * 2
+            expected = [render(*job) for job in jobs]
+            with ThreadPoolExecutor(8) as executor:
+                self.assertEqual(list(executor.map(lambda job: render(*job), jobs)), expected)
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,26 +2,23 @@
 # https://github.com/stefanhaustein/TerminalImageViewer
 # License: Apache 2.0
 
+import sys
+from typing import BinaryIO, Optional
 from PIL import Image
 from ImageData import ImageData
 
-def dump(image: Image.Image, mode: str, html: bool):
+def dump(image: Image.Image, mode: str, html: bool, out: Optional[BinaryIO] = None):
     """
-    Takes an image and generates a string representation of the image using block characters and ANSI color codes (or HTML).
+    Takes an image and writes a representation of the image using block characters and ANSI color codes (or HTML).
+    The output goes to the binary stream out, or to standard output if out is None.
     """
 
-    w, h = image.size
-    image_data = ImageData(w, h)
-    
-    # Convert image to RGB
-    image_rgb = image.convert("RGB")
+    image_data = ImageData.from_image(image)
 
-    for y in range(h):
-        for x in range(w):
-            r, g, b = image_rgb.getpixel((x, y))
-            pos = (y * w + x) * 4
-            image_data.data[pos] = r
-            image_data.data[pos + 1] = g
-            image_data.data[pos + 2] = b
-
-    print(image_data.dump(mode, html))
+    # Write the encoded output straight to the binary stream, flushing any pending text first to keep ordering
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    out.write(image_data.dump(mode, html))
+    out.write(b"\n")
+    out.flush()
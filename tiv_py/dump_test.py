@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import Mock, patch
-from io import StringIO
+from io import BytesIO, TextIOWrapper
 import sys
 from PIL import Image
 from tiv_py.dump import dump
@@ -18,14 +18,14 @@ class TestDumpFunction(unittest.TestCase):
         self.image_data_mock.data = [0] * (2 * 2 * 4)  # Example data buffer for 2x2 image with RGB values
         
         # Patch the print function to capture output
-        self.capturedOutput = StringIO()
-        sys.stdout = self.capturedOutput
+        self.capturedOutput = BytesIO()
+        sys.stdout = TextIOWrapper(self.capturedOutput, encoding='utf-8')
 
     def test_dump_with_ansi(self):
         # Test the dump function with ANSI output mode
-        with patch('tiv_py.dump.ImageData', return_value=self.image_data_mock):
+        with patch('tiv_py.dump.ImageData.from_image', return_value=self.image_data_mock):
             # Configure the mock to return the expected ANSI string
-            self.image_data_mock.dump.return_value = "\x1b[48;2;255;0;0m \x1b[0m\n" * 2  # Assuming a 2x2 image produces 2 blocks of red
+            self.image_data_mock.dump.return_value = b"\x1b[48;2;255;0;0m \x1b[0m\n" * 2  # Assuming a 2x2 image produces 2 blocks of red
     
             dump(self.image, mode='256', html=False)
             expected_output = self.image_data_mock.dump.return_value
@@ -34,9 +34,9 @@ class TestDumpFunction(unittest.TestCase):
 
     def test_dump_with_html(self):
         # Test the dump function with HTML output mode
-        with patch('tiv_py.dump.ImageData', return_value=self.image_data_mock):
+        with patch('tiv_py.dump.ImageData.from_image', return_value=self.image_data_mock):
             # Configure the mock to return the expected HTML string
-            self.image_data_mock.dump.return_value = '<span style="background-color: #ff0000;"> </span>\n' * 2  # Assuming a 2x2 image produces 4 spans
+            self.image_data_mock.dump.return_value = b'<span style="background-color: #ff0000;"> </span>\n' * 2  # Assuming a 2x2 image produces 4 spans
 
             dump(self.image, mode='256', html=True)
             expected_output = self.image_data_mock.dump.return_value  # Expected output string
@@ -0,0 +1,80 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import struct
+from io import BytesIO
+from typing import Optional
+from PIL import Image, ImageOps, ExifTags
+from resize_image import target_size
+
+# Prefix of the EXIF data PIL stores in image.info, the TIFF structure and its offsets start after it.
+EXIF_HEADER = b"Exif\x00\x00"
+
+# Transpositions that show an image with the given EXIF orientation upright.
+TRANSPOSES = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Orientations that swap width and height when applied.
+TRANSPOSING_ORIENTATIONS = (5, 6, 7, 8)
+
+# Largest relative difference between the aspect ratios of a thumbnail and its image.
+# Thumbnails that differ more are letterboxed or cropped and are not used.
+MAX_ASPECT_DIFFERENCE = 0.02
+
+def orientation(image: Image.Image) -> int:
+    """
+    Returns the EXIF orientation of an image, 1 if it has none.
+    """
+    return image.getexif().get(ExifTags.Base.Orientation, 1)
+
+def oriented(image: Image.Image) -> Image.Image:
+    """
+    Rotates and flips an image as its EXIF orientation requires, so it is shown upright.
+    Images without an orientation are returned as they are, still undecoded if they were opened lazily.
+    """
+    if orientation(image) == 1:
+        return image
+    return ImageOps.exif_transpose(image)
+
+def exif_thumbnail(image: Image.Image, max_width: int, max_height: int) -> Optional[Image.Image]:
+    """
+    Returns the thumbnail embedded in the EXIF data of an image, if it has the aspect ratio of the image and is large enough to be resized to fit within max_width and max_height.
+    Otherwise returns None. Only the thumbnail is decoded, not the image itself.
+
+    The thumbnail is stored unrotated like the image and has no orientation of its own, it is returned rotated and flipped by the orientation of the image.
+    """
+    exif = image.info.get("exif")
+    if not isinstance(exif, bytes) or not exif.startswith(EXIF_HEADER):
+        return None
+
+    try:
+        tags = image.getexif()
+        thumbnail_ifd = tags.get_ifd(ExifTags.IFD.IFD1)
+        offset = thumbnail_ifd.get(ExifTags.Base.JpegIFOffset)
+        length = thumbnail_ifd.get(ExifTags.Base.JpegIFByteCount)
+        if not offset or not length:
+            return None
+        start = len(EXIF_HEADER) + offset
+        thumbnail = Image.open(BytesIO(exif[start:start + length]))
+        thumbnail.load()
+    except (OSError, ValueError, SyntaxError, struct.error):
+        return None
+
+    # Compare in the stored orientation of the image, max_width and max_height apply to the upright image
+    turn = tags.get(ExifTags.Base.Orientation, 1)
+    if turn in TRANSPOSING_ORIENTATIONS:
+        max_width, max_height = max_height, max_width
+    width, height = target_size(image.width, image.height, max_width, max_height)
+    if thumbnail.width < width or thumbnail.height < height:
+        return None
+    if abs(thumbnail.width / thumbnail.height - image.width / image.height) > MAX_ASPECT_DIFFERENCE * image.width / image.height:
+        return None
+    return thumbnail.transpose(TRANSPOSES[turn]) if turn in TRANSPOSES else thumbnail
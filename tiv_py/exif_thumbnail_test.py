@@ -0,0 +1,93 @@
+import os
+import struct
+import tempfile
+import unittest
+from io import BytesIO
+from PIL import Image
+from tiv_py.exif_thumbnail import exif_thumbnail, orientation, oriented
+from tiv_py.load_image import load_image
+
+def camera_jpeg(path, size, thumbnail_size, turn=1):
+    """
+    Writes a JPEG the way cameras do: an EXIF orientation and an embedded thumbnail.
+    The image is red on its left half and blue on its right half, the thumbnail is yellow and cyan, so they can be told apart.
+    """
+    def halves(size, left, right):
+        image = Image.new('RGB', size, right)
+        image.paste(left, (0, 0, size[0] // 2, size[1]))
+        return image
+
+    buffer = BytesIO()
+    halves(thumbnail_size, (255, 255, 0), (0, 255, 255)).save(buffer, 'JPEG')
+    thumbnail = buffer.getvalue()
+
+    # Little endian TIFF header, IFD0 with the orientation, IFD1 with the thumbnail location, then the thumbnail
+    tiff = b'II' + struct.pack('<HI', 42, 8)
+    tiff += struct.pack('<H', 1) + struct.pack('<HHIHH', 0x0112, 3, 1, turn, 0) + struct.pack('<I', 26)
+    tiff += struct.pack('<H', 2) + struct.pack('<HHII', 0x0201, 4, 1, 56) + struct.pack('<HHII', 0x0202, 4, 1, len(thumbnail)) + struct.pack('<I', 0)
+    halves(size, (255, 0, 0), (0, 0, 255)).save(path, 'JPEG', exif=b'Exif\x00\x00' + tiff + thumbnail)
+
+class TestExifThumbnail(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'photo.jpg')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertColor(self, color, expected):
+        for channel, value in zip(color, expected):
+            self.assertAlmostEqual(channel, value, delta=16)
+
+    def test_exif_thumbnail(self):
+        # Large enough for the default output size of 80x24 cells
+        camera_jpeg(self.path, (1280, 960), (320, 240))
+        with Image.open(self.path) as image:
+            thumbnail = exif_thumbnail(image, 80 * 4, 24 * 8)
+            self.assertEqual(thumbnail.size, (320, 240))
+            self.assertColor(thumbnail.getpixel((10, 120)), (255, 255, 0))
+
+            # Too small for a larger output
+            self.assertIsNone(exif_thumbnail(image, 640, 480))
+
+    def test_exif_thumbnail_aspect_ratio(self):
+        # A letterboxed thumbnail is not used
+        camera_jpeg(self.path, (640, 480), (160, 160))
+        with Image.open(self.path) as image:
+            self.assertIsNone(exif_thumbnail(image, 80, 60))
+
+    def test_exif_thumbnail_without_exif(self):
+        Image.new('RGB', (640, 480)).save(self.path, 'JPEG')
+        with Image.open(self.path) as image:
+            self.assertIsNone(exif_thumbnail(image, 80, 60))
+            self.assertEqual(orientation(image), 1)
+            self.assertIs(oriented(image), image)
+
+    def test_exif_thumbnail_orientation(self):
+        # Stored landscape, shown portrait: the red left half ends up at the top
+        camera_jpeg(self.path, (640, 480), (160, 120), turn=6)
+        with Image.open(self.path) as image:
+            self.assertEqual(orientation(image), 6)
+            self.assertIsNone(exif_thumbnail(image, 200, 200))
+            thumbnail = exif_thumbnail(image, 90, 120)
+            self.assertEqual(thumbnail.size, (120, 160))
+            self.assertColor(thumbnail.getpixel((60, 10)), (255, 255, 0))
+
+    def test_load_image(self):
+        camera_jpeg(self.path, (640, 480), (160, 120), turn=6)
+
+        image = load_image(self.path, max_size=(90, 120))
+        self.assertEqual(image.size, (120, 160))
+        self.assertColor(image.getpixel((60, 10)), (255, 255, 0))
+
+        # The full image is oriented the same way
+        image = load_image(self.path)
+        self.assertEqual(image.size, (480, 640))
+        self.assertColor(image.getpixel((240, 10)), (255, 0, 0))
+
+        image = load_image(self.path, max_size=(480, 640))
+        self.assertEqual(image.size, (480, 640))
+
+if __name__ == '__main__':
+    unittest.main()
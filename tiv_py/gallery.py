@@ -0,0 +1,126 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import os
+import sys
+import glob
+import shutil
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional
+from PIL import Image
+from Ansi import Ansi
+from CellGrid import CellGrid
+from ImageData import ImageData
+from load_image import load_image
+from resize_image import resize_image
+
+# Number of blank cells between two tiles.
+GAP = 1
+
+def gallery_sources(source: str) -> Iterator[str]:
+    """
+    Lazily lists the files in a directory, or the files matching a glob pattern.
+    """
+    if os.path.isdir(source):
+        with os.scandir(source) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.path
+    else:
+        for name in glob.iglob(source):
+            if os.path.isfile(name):
+                yield name
+
+def render_tile(name: str, tile_width: int, tile_height: int, grayscale: bool, full_decode: bool = False) -> Optional[CellGrid]:
+    """
+    Analyzes a thumbnail of an image fitting tile_width x tile_height cells, or returns None if it cannot be read.
+    """
+    try:
+        max_size = (tile_width * 4, tile_height * 8)
+        image = resize_image(load_image(name, max_size=None if full_decode else max_size), *max_size, grayscale)
+        return ImageData.from_image(image).cells()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+def caption(name: str, width: int) -> bytes:
+    """
+    Returns the file name of a path as a caption of exactly width terminal columns, truncated or padded with spaces.
+    Characters that are not printable are shown as '?', like ls does, so file names cannot inject escape sequences into the terminal.
+    Wide characters take two columns and combining characters none.
+    """
+    text = ""
+    columns = 0
+    for character in os.path.basename(name):
+        if not character.isprintable():
+            character = "?"
+        if unicodedata.combining(character):
+            character_width = 0
+        elif unicodedata.east_asian_width(character) in ("W", "F"):
+            character_width = 2
+        else:
+            character_width = 1
+        if columns + character_width > width:
+            break
+        text += character
+        columns += character_width
+    return (text + " " * (width - columns)).encode("utf-8", "replace")
+
+def tile_row(names: list[str], grids: list[Optional[CellGrid]], tile_width: int, tile_height: int, mode) -> bytes:
+    """
+    Lays out one row of tiles side by side, with the file names as captions below them.
+    """
+    output = bytearray()
+    gap = b" " * GAP
+    for y in range(tile_height):
+        for grid in grids:
+            if grid is not None and y < grid.height:
+                output += grid.ansi_row(y, mode) + Ansi.RESET_BYTES + b" " * (tile_width - grid.width)
+            else:
+                output += b" " * tile_width
+            output += gap
+        output += b"\n"
+    for name in names:
+        output += caption(name, tile_width) + gap
+    output += b"\n"
+    return bytes(output)
+
+def gallery(source: str, tile_width: int, mode, grayscale: bool, jobs: Optional[int] = None, out: Optional[BinaryIO] = None,
+            full_decode: bool = False):
+    """
+    Shows the images in a directory, or matching a glob pattern, as a grid of thumbnails that fits the terminal width.
+    Thumbnails are rendered concurrently by a pool of worker processes, and each grid row is written as soon as all its tiles are ready.
+    Only a few rows are in flight at any time, so memory use does not depend on the number of files.
+    Unless full_decode is set, photos with a large enough embedded EXIF thumbnail are rendered from it.
+    """
+
+    tile_height = max(1, tile_width // 2)
+    columns = max(1, (shutil.get_terminal_size().columns + GAP) // (tile_width + GAP))
+    jobs = jobs or os.cpu_count() or 1
+    rows_ahead = max(2, -(-2 * jobs // columns))
+
+    names = gallery_sources(source)
+    pending = deque()
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+
+    with ProcessPoolExecutor(jobs) as executor:
+        def submit_row() -> bool:
+            row = list(islice(names, columns))
+            if row:
+                pending.append((row, [executor.submit(render_tile, name, tile_width, tile_height, grayscale, full_decode) for name in row]))
+            return bool(row)
+
+        while len(pending) < rows_ahead and submit_row():
+            pass
+
+        while pending:
+            row, futures = pending.popleft()
+            grids = [future.result() for future in futures]
+            submit_row()
+            out.write(tile_row(row, grids, tile_width, tile_height, mode))
+            out.flush()
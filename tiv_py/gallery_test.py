@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import BytesIO, TextIOWrapper
+from unittest.mock import patch
+from PIL import Image
+from tiv_py.gallery import caption, gallery, gallery_sources, render_tile, tile_row
+
+class TestGallery(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for name, color in (('a.png', 'red'), ('b.png', 'green'), ('c.jpg', 'blue')):
+            Image.new('RGB', (64, 64), color = color).save(os.path.join(self.directory.name, name))
+        with open(os.path.join(self.directory.name, 'notes.txt'), 'w') as f:
+            f.write('not an image')
+        os.mkdir(os.path.join(self.directory.name, 'subdirectory'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_gallery_sources_directory(self):
+        names = sorted(os.path.basename(name) for name in gallery_sources(self.directory.name))
+        self.assertEqual(names, ['a.png', 'b.png', 'c.jpg', 'notes.txt'])
+
+    def test_gallery_sources_glob(self):
+        names = sorted(os.path.basename(name) for name in gallery_sources(os.path.join(self.directory.name, '*.png')))
+        self.assertEqual(names, ['a.png', 'b.png'])
+
+    def test_render_tile(self):
+        grid = render_tile(os.path.join(self.directory.name, 'a.png'), 4, 2, False)
+        self.assertEqual((grid.width, grid.height), (4, 2))
+        self.assertIsNone(render_tile(os.path.join(self.directory.name, 'notes.txt'), 4, 2, False))
+
+    def test_tile_row(self):
+        grid = render_tile(os.path.join(self.directory.name, 'a.png'), 4, 2, False)
+        output = tile_row(['a.png', 'long_name.png'], [grid, None], 4, 2, '256')
+        lines = output.split(b'\n')
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith(b'\x1b[38;5;'))
+        self.assertTrue(lines[0].endswith(b'\x1b[0m ' + b' ' * 4 + b' '))
+        self.assertEqual(lines[2], b'a.png'[:4] + b' ' + b'long' + b' ')
+
+    def test_caption(self):
+        self.assertEqual(caption('/photos/a.png', 8), b'a.png   ')
+        self.assertEqual(caption('/photos/long_name.png', 4), b'long')
+
+        # Control characters cannot reach the terminal
+        self.assertEqual(caption('/photos/\x1b[2Jx.png', 8), b'?[2Jx.pn')
+        self.assertEqual(caption('a\tb\nc', 6), b'a?b?c ')
+
+        # Wide characters take two columns, a wide character that does not fit is left out
+        self.assertEqual(caption('\u5199\u771f.jpg', 6), '\u5199\u771f.j'.encode('utf-8'))
+        self.assertEqual(caption('\u5199\u771f.jpg', 3), '\u5199 '.encode('utf-8'))
+        self.assertEqual(caption('cafe\u0301.png', 5), 'cafe\u0301.'.encode('utf-8'))
+
+    @patch('tiv_py.gallery.shutil.get_terminal_size', return_value=os.terminal_size((9, 24)))
+    def test_gallery(self, mock_get_terminal_size):
+        # Two tiles of 4 cells and a gap fit in 9 columns, so four files make two rows
+        captured = BytesIO()
+        sys.stdout = TextIOWrapper(captured, encoding='utf-8')
+        try:
+            gallery(self.directory.name, 4, '256', False, jobs=2)
+            lines = captured.getvalue().split(b'\n')
+        finally:
+            sys.stdout = sys.__stdout__
+
+        self.assertEqual(len(lines), 2 * 3 + 1)
+        captions = sorted(lines[2].split() + lines[5].split())
+        self.assertEqual(captions, [b'a.pn', b'b.pn', b'c.jp', b'note'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,17 +2,62 @@
 # https://github.com/stefanhaustein/TerminalImageViewer
 # License: Apache 2.0
 
-from PIL import Image
+from typing import Optional
+from PIL import Image, ImageFile
 import requests
-from io import BytesIO
+from exif_thumbnail import exif_thumbnail, oriented
 
-def load_image(name: str) -> Image.Image:
+# Largest response body that will be downloaded for a URL source.
+MAX_DOWNLOAD_BYTES = 64 * 1024 * 1024
+
+# Size of the chunks fed to the incremental decoder while downloading.
+CHUNK_SIZE = 64 * 1024
+
+# Amount of data after which the response must have been identified as an image.
+SNIFF_BYTES = 1024 * 1024
+
+def load_image(name: str, max_bytes: int = MAX_DOWNLOAD_BYTES, max_size: Optional[tuple[int, int]] = None) -> Image.Image:
     """
-    Loads an image from a local file or a URL.
+    Loads an image from a local file or a URL, rotated and flipped as its EXIF orientation requires.
+
+    URLs are streamed in chunks into PIL's incremental parser, so decoding overlaps the transfer.
+    The download is aborted with a ValueError as soon as it exceeds max_bytes or turns out not to be an image.
+
+    If max_size is given as (max_width, max_height), the image will only be shown resized to fit within it.
+    For local files, the thumbnail embedded in the EXIF data is then returned instead if it is large enough, and the full image is never decoded.
     """
 
     # Check if the given string is a URL
     if name.startswith("http://") or name.startswith("https://"):
-        response = requests.get(name)
-        return Image.open(BytesIO(response.content))
-    return Image.open(name)
\ No newline at end of file
+        response = requests.get(name, stream=True)
+        try:
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "").lower()
+            if content_type and not content_type.startswith(("image/", "application/octet-stream")):
+                raise ValueError(f"{name} is not an image ({content_type})")
+
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > max_bytes:
+                raise ValueError(f"{name} exceeds the maximum download size of {max_bytes} bytes")
+
+            parser = ImageFile.Parser()
+            received = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ValueError(f"{name} exceeds the maximum download size of {max_bytes} bytes")
+                parser.feed(chunk)
+                if parser.image is None and received > SNIFF_BYTES:
+                    raise ValueError(f"{name} is not an image")
+            return oriented(parser.close())
+        finally:
+            response.close()
+
+    image = Image.open(name)
+    if max_size is not None:
+        thumbnail = exif_thumbnail(image, *max_size)
+        if thumbnail is not None:
+            image.close()
+            return thumbnail
+    return oriented(image)
@@ -0,0 +1,32 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional
+from PIL import Image
+from is_url import is_url
+from load_image import load_image, MAX_DOWNLOAD_BYTES
+
+def load_decoded_image(name: str, max_bytes: int = MAX_DOWNLOAD_BYTES, max_size: Optional[tuple[int, int]] = None) -> Image.Image:
+    """
+    Loads an image like load_image, but also decodes local files, which Image.open only opens lazily.
+    """
+    image = load_image(name, max_bytes, max_size)
+    image.load()
+    return image
+
+async def load_image_async(name: str, max_bytes: int = MAX_DOWNLOAD_BYTES, executor: Optional[Executor] = None,
+                           semaphore: Optional[asyncio.Semaphore] = None, max_size: Optional[tuple[int, int]] = None) -> Image.Image:
+    """
+    Asynchronous counterpart of load_image, returning a fully decoded image.
+    The download and the decode run in executor (the loop's default executor if None), so the event loop is never blocked.
+    URL downloads are limited to the concurrency of semaphore, if given.
+    As with load_image, a large enough embedded EXIF thumbnail is returned instead if max_size is given.
+    """
+    loop = asyncio.get_running_loop()
+    if semaphore is not None and is_url(name):
+        async with semaphore:
+            return await loop.run_in_executor(executor, load_decoded_image, name, max_bytes, max_size)
+    return await loop.run_in_executor(executor, load_decoded_image, name, max_bytes, max_size)
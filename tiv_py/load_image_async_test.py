@@ -0,0 +1,47 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from PIL import Image
+from tiv_py.load_image_async import load_image_async
+
+class TestLoadImageAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_load_image_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'image.png')
+            Image.new('RGB', (8, 4), color = 'red').save(name)
+
+            image = await load_image_async(name)
+
+            # The image is decoded before it is returned
+            self.assertEqual(image.size, (8, 4))
+            self.assertEqual(image.getpixel((0, 0)), (255, 0, 0))
+
+    @patch('tiv_py.load_image_async.load_decoded_image')
+    async def test_url_concurrency_limit(self, mock_load_decoded_image):
+        lock = threading.Lock()
+        active = [0, 0]  # Current and highest number of concurrent downloads
+
+        def load(name, max_bytes, max_size):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return name
+
+        mock_load_decoded_image.side_effect = load
+        semaphore = asyncio.Semaphore(2)
+        names = [f'http://example.com/{i}.png' for i in range(8)]
+        results = await asyncio.gather(*(load_image_async(name, semaphore=semaphore) for name in names))
+
+        self.assertEqual(results, names)
+        self.assertEqual(active[1], 2)
+
+if __name__ == '__main__':
+    unittest.main()
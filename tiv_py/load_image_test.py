@@ -1,33 +1,90 @@
 import unittest
 from unittest.mock import patch, Mock
+from io import BytesIO
+from PIL import Image
 from tiv_py.load_image import load_image
 
 class TestLoadImage(unittest.TestCase):
 
-    @patch('requests.get')
-    @patch('PIL.Image.open')
-    def test_load_image_from_url(self, mock_image_open, mock_requests_get):
-        # Setup mock for requests.get
+    def mock_response(self, chunks, headers=None):
         mock_response = Mock()
-        expected_image_data = b'image data'
-        mock_response.content = expected_image_data
-        mock_requests_get.return_value = mock_response
+        mock_response.headers = headers if headers is not None else {'Content-Type': 'image/png'}
+        mock_response.iter_content.return_value = iter(chunks)
+        return mock_response
 
-        # Setup mock for PIL.Image.open
-        mock_image = Mock()
-        mock_image_open.return_value = mock_image
+    def png_bytes(self, size=(8, 4)):
+        buffer = BytesIO()
+        Image.new('RGB', size, color='red').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @patch('requests.get')
+    def test_load_image_from_url(self, mock_requests_get):
+        # Serve the image in small chunks to exercise the incremental parser
+        data = self.png_bytes()
+        chunks = [data[i:i + 16] for i in range(0, len(data), 16)]
+        mock_response = self.mock_response(chunks)
+        mock_requests_get.return_value = mock_response
 
         image = load_image('http://example.com/image.png')
 
-        # Assert that the image was loaded correctly
-        mock_requests_get.assert_called_once_with('http://example.com/image.png')
-        mock_image_open.assert_called_once()
-        self.assertEqual(image, mock_image)
+        # Assert that the image was streamed and decoded correctly
+        mock_requests_get.assert_called_once_with('http://example.com/image.png', stream=True)
+        mock_response.close.assert_called_once()
+        self.assertEqual(image.size, (8, 4))
+        self.assertEqual(image.getpixel((0, 0)), (255, 0, 0))
+
+    @patch('requests.get')
+    def test_load_image_from_url_too_large(self, mock_requests_get):
+        data = self.png_bytes((64, 64))
+        mock_response = self.mock_response([data[:64], data[64:]])
+        mock_requests_get.return_value = mock_response
+
+        with self.assertRaises(ValueError):
+            load_image('http://example.com/image.png', max_bytes=100)
+        mock_response.close.assert_called_once()
+
+    @patch('requests.get')
+    def test_load_image_from_url_content_length_too_large(self, mock_requests_get):
+        mock_response = self.mock_response([], {'Content-Type': 'image/png', 'Content-Length': '1000'})
+        mock_requests_get.return_value = mock_response
+
+        with self.assertRaises(ValueError):
+            load_image('http://example.com/image.png', max_bytes=100)
+        mock_response.iter_content.assert_not_called()
+
+    @patch('requests.get')
+    def test_load_image_from_url_not_an_image(self, mock_requests_get):
+        mock_response = self.mock_response([b'<html></html>'], {'Content-Type': 'text/html'})
+        mock_requests_get.return_value = mock_response
+
+        with self.assertRaises(ValueError):
+            load_image('http://example.com/page.html')
+        mock_response.iter_content.assert_not_called()
+
+    @patch('requests.get')
+    def test_load_image_from_url_without_image_header(self, mock_requests_get):
+        # Without a Content-Type the body is given up on once more than SNIFF_BYTES arrived without an image header
+        mock_response = self.mock_response([b'x' * 65536] * 32, {})
+        mock_requests_get.return_value = mock_response
+
+        chunks = mock_response.iter_content.return_value
+        with self.assertRaisesRegex(ValueError, 'is not an image'):
+            load_image('http://example.com/download')
+        mock_response.close.assert_called_once()
+
+        # The rest of the body is not downloaded
+        self.assertGreater(len(list(chunks)), 0)
+
+    @patch('requests.get')
+    def test_load_image_from_url_content_type_case(self, mock_requests_get):
+        mock_requests_get.return_value = self.mock_response([self.png_bytes()], {'Content-Type': 'Image/PNG'})
+        self.assertEqual(load_image('http://example.com/image.png').size, (8, 4))
 
     @patch('PIL.Image.open')
     def test_load_image_from_file(self, mock_image_open):
         # Setup mock for PIL.Image.open
         mock_image = Mock()
+        mock_image.getexif.return_value = {}
         mock_image_open.return_value = mock_image
 
         image = load_image('/path/to/local/image.png')
@@ -13,16 +13,53 @@ class TestMainFunction(unittest.TestCase):
         mock_args.max_width = 20
         mock_args.max_height = 10
         mock_args.stdin = False
+        mock_args.gallery = None
+        mock_args.watch = False
         mock_args.html = False
         mock_args.grayscale = False
+        mock_args.full_decode = False
         mock_args.image_source = "image.png"
         
         main()
         
         mock_convert.assert_called_once_with(
-            "image.png", 80, 80, Ansi.MODE_24BIT, False, False
+            "image.png", 80, 80, Ansi.MODE_24BIT, False, False, full_decode=False
         )
 
+    @patch('tiv_py.__main__.parse_args')
+    @patch('tiv_py.__main__.gallery')
+    def test_main_with_gallery(self, mock_gallery, mock_parse_args):
+        mock_args = mock_parse_args.return_value
+        mock_args.mode = "256"
+        mock_args.stdin = False
+        mock_args.gallery = "photos"
+        mock_args.tile_width = 16
+        mock_args.jobs = None
+        mock_args.grayscale = False
+        mock_args.full_decode = True
+
+        main()
+
+        mock_gallery.assert_called_once_with("photos", 16, Ansi.MODE_256, False, None, full_decode=True)
+
+    @patch('tiv_py.__main__.parse_args')
+    @patch('tiv_py.__main__.watch')
+    def test_main_with_watch(self, mock_watch, mock_parse_args):
+        mock_args = mock_parse_args.return_value
+        mock_args.mode = "24bit"
+        mock_args.max_width = 20
+        mock_args.max_height = 10
+        mock_args.stdin = False
+        mock_args.gallery = None
+        mock_args.watch = True
+        mock_args.interval = 2.0
+        mock_args.grayscale = False
+        mock_args.image_source = "chart.png"
+
+        main()
+
+        mock_watch.assert_called_once_with("chart.png", 80, 80, Ansi.MODE_24BIT, False, 2.0)
+
 @patch('tiv_py.parse_args')
 @patch('sys.stdin', new_callable=mock_open, read_data="image.png\n\n")
 @patch('tiv_py.__main__.convert')
@@ -19,6 +19,9 @@ def parse_args() -> argparse.Namespace:
     # Image source: standard input
     source_group.add_argument("--stdin", action="store_true", help="Read image path or URL from the standard input.")
 
+    # Image source: directory or glob pattern shown as a gallery
+    source_group.add_argument("--gallery", help="Show the images in a directory, or matching a glob pattern, as a grid of thumbnails.")
+
     # Output mode: either 256-color mode or 24-bit mode
     parser.add_argument('--mode', choices=['256', '24bit'], default='256', help='ANSI color mode. Either 256-color mode or 24-bit mode. Default is 256-color mode.')
 
@@ -32,9 +35,24 @@ def parse_args() -> argparse.Namespace:
     # Grayscale
     parser.add_argument('--grayscale', action='store_true', help='Convert the image to grayscale before processing.')
 
+    # Decoding
+    parser.add_argument('--full_decode', action='store_true', help='Always decode the full image, even if an embedded EXIF thumbnail is large enough for the output.')
+
+    # Gallery layout
+    parser.add_argument('--tile_width', type=int, default=16, help='Width of the gallery thumbnails. Default is 16.')
+    parser.add_argument('--jobs', type=int, help='Number of worker processes rendering gallery thumbnails. Default is the number of CPUs.')
+
+    # Watch mode
+    parser.add_argument('--watch', action='store_true', help='Keep the image up to date while its source is rewritten, redrawing only the changed parts.')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between checks of the source in watch mode. Default is 1.')
+
     # Parsing and validation
     args = parser.parse_args()
-    if not args.stdin and not is_url(args.image_source) and not os.path.isfile(args.image_source):
+    if args.image_source is not None and not is_url(args.image_source) and not os.path.isfile(args.image_source):
         parser.error("Invalid image_source")
+    if args.gallery and args.html:
+        parser.error("--html is not supported with --gallery")
+    if args.watch and (args.image_source is None or args.html):
+        parser.error("--watch requires an image_source and ANSI output")
 
     return args
@@ -47,6 +47,37 @@ class TestParseArgs(unittest.TestCase):
             self.assertEqual(args.max_width, 100)
             self.assertEqual(args.max_height, 50)
 
+    def test_gallery(self):
+        test_args = ["--gallery", "photos/*.jpg", "--tile_width", "20", "--jobs", "4"]
+        with patch('sys.argv', ['prog'] + test_args):
+            args = parse_args()
+            self.assertEqual(args.gallery, "photos/*.jpg")
+            self.assertIsNone(args.image_source)
+            self.assertEqual(args.tile_width, 20)
+            self.assertEqual(args.jobs, 4)
+
+    @patch('tiv_py.parse_args.argparse.ArgumentParser.error')
+    def test_gallery_html(self, mock_error):
+        test_args = ["--gallery", "photos", "--html"]
+        with patch('sys.argv', ['prog'] + test_args):
+            parse_args()
+            mock_error.assert_called_with("--html is not supported with --gallery")
+
+    @patch('tiv_py.parse_args.os.path.isfile', return_value=True)
+    def test_watch(self, mock_isfile):
+        test_args = ["chart.png", "--watch", "--interval", "0.5"]
+        with patch('sys.argv', ['prog'] + test_args):
+            args = parse_args()
+            self.assertTrue(args.watch)
+            self.assertEqual(args.interval, 0.5)
+
+    @patch('tiv_py.parse_args.argparse.ArgumentParser.error')
+    def test_watch_stdin(self, mock_error):
+        test_args = ["--stdin", "--watch"]
+        with patch('sys.argv', ['prog'] + test_args):
+            parse_args()
+            mock_error.assert_called_with("--watch requires an image_source and ANSI output")
+
     @patch('tiv_py.parse_args.argparse.ArgumentParser.error')  # Mock the error method of ArgumentParser
     @patch('tiv_py.parse_args.os.path.isfile', return_value=False)  # Mock os.path.isfile to always return False
     @patch('tiv_py.parse_args.is_url', return_value=False)  # Mock is_url to always return False
@@ -0,0 +1,64 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+from PIL import Image
+from ImageData import ImageData
+from load_image import MAX_DOWNLOAD_BYTES
+from load_image_async import load_image_async
+from resize_image import resize_image
+
+def render_image(image: Image.Image, max_width: int, max_height: int, mode: str, html: bool, grayscale: bool) -> bytes:
+    """
+    Resizes a decoded image and returns its rendering, as convert would write it.
+    """
+    image = resize_image(image, max_width, max_height, grayscale)
+    return ImageData.from_image(image).dump(mode, html) + b"\n"
+
+async def render_async(name: str, max_width: int, max_height: int, mode: str, html: bool, grayscale: bool,
+                       executor: Optional[Executor] = None, semaphore: Optional[asyncio.Semaphore] = None,
+                       max_bytes: int = MAX_DOWNLOAD_BYTES, full_decode: bool = False) -> bytes:
+    """
+    Asynchronous counterpart of convert, returning the output instead of writing it.
+    Loading, resizing and the cell analysis run in executor, which may be a process pool for CPU-bound workloads.
+    Like convert, it uses a large enough embedded EXIF thumbnail unless full_decode is set.
+    """
+    max_size = None if full_decode else (max_width, max_height)
+    image = await load_image_async(name, max_bytes, executor, semaphore, max_size)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, render_image, image, max_width, max_height, mode, html, grayscale)
+
+async def iterate(sources: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if isinstance(sources, AsyncIterable):
+        async for name in sources:
+            yield name
+    else:
+        for name in sources:
+            yield name
+
+async def render_stream(sources: Union[Iterable[str], AsyncIterable[str]], max_width: int, max_height: int, mode: str, html: bool,
+                        grayscale: bool, concurrency: int = 4, executor: Optional[Executor] = None,
+                        semaphore: Optional[asyncio.Semaphore] = None, full_decode: bool = False) -> AsyncIterator[tuple[str, bytes]]:
+    """
+    Renders many sources, yielding (name, output) pairs in the order of the sources.
+    At most concurrency sources are in flight, and the next source is only taken once the consumer has asked for the oldest result, so a slow consumer holds back the producer.
+    An error rendering a source is raised from the iteration; renders still in flight are then cancelled.
+    """
+    pending = deque()
+    try:
+        async for name in iterate(sources):
+            pending.append((name, asyncio.ensure_future(
+                render_async(name, max_width, max_height, mode, html, grayscale, executor, semaphore, full_decode=full_decode))))
+            if len(pending) >= concurrency:
+                name, task = pending.popleft()
+                yield name, await task
+        while pending:
+            name, task = pending.popleft()
+            yield name, await task
+    finally:
+        for name, task in pending:
+            task.cancel()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+from PIL import Image
+from tiv_py.convert import convert
+from tiv_py.exif_thumbnail_test import camera_jpeg
+from tiv_py.render_async import render_async, render_stream
+
+class TestRenderAsync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.names = []
+        for i, color in enumerate(('red', 'green', 'blue')):
+            name = os.path.join(self.directory.name, f'{i}.png')
+            Image.new('RGB', (32, 32), color = color).save(name)
+            self.names.append(name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_render_async(self):
+        # The output is the same as convert writes
+        out = BytesIO()
+        convert(self.names[0], 16, 16, '256', False, False, out)
+        self.assertEqual(await render_async(self.names[0], 16, 16, '256', False, False), out.getvalue())
+
+    async def test_render_async_exif_thumbnail(self):
+        # Camera photos are rendered from the same embedded thumbnail, or the same full image, as convert uses
+        name = os.path.join(self.directory.name, 'photo.jpg')
+        camera_jpeg(name, (1280, 960), (320, 240), turn=6)
+        outputs = []
+        for full_decode in (False, True):
+            out = BytesIO()
+            convert(name, 80, 120, '256', False, False, out, full_decode=full_decode)
+            self.assertEqual(await render_async(name, 80, 120, '256', False, False, full_decode=full_decode), out.getvalue())
+            outputs.append(out.getvalue())
+        self.assertNotEqual(outputs[0], outputs[1])
+        results = [result async for result in render_stream([name], 80, 120, '256', False, False)]
+        self.assertEqual(results[0][1], await render_async(name, 80, 120, '256', False, False))
+
+    async def test_render_stream(self):
+        results = [result async for result in render_stream(reversed(self.names), 16, 16, '24bit', False, True, concurrency=2)]
+        self.assertEqual([name for name, output in results], self.names[::-1])
+        self.assertIn(b'\x1b[48;2;', results[0][1])
+
+    @patch('tiv_py.render_async.render_async')
+    async def test_render_stream_backpressure(self, mock_render_async):
+        async def render(name, *args, **kwargs):
+            return name.encode()
+
+        mock_render_async.side_effect = render
+        taken = []
+
+        async def sources():
+            for i in range(10):
+                taken.append(i)
+                yield str(i)
+
+        stream = render_stream(sources(), 16, 16, '256', False, False, concurrency=3)
+        self.assertEqual(await anext(stream), ('0', b'0'))
+
+        # Only as many sources as can be in flight are taken before the consumer asks for more
+        self.assertEqual(taken, [0, 1, 2])
+        await stream.aclose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,16 @@
 
 from PIL import Image
 
+def target_size(original_width: int, original_height: int, max_width: int, max_height: int) -> tuple[int, int]:
+    """
+    Computes the size an image of the given dimensions is scaled to so it fits within max_width and max_height.
+    """
+
+    # The image is scaled by the smallest of the two ratios (width and height)
+    # to ensure it fits within the provided dimensions.
+    scale = min(max_width / original_width, max_height / original_height)
+    return int(original_width * scale), int(original_height * scale)
+
 def resize_image(original: Image.Image, max_width: int, max_height: int, grayscale: bool) -> Image.Image:
     """
     Resize an image to fit within specified dimensions without cropping or distorting it.
@@ -19,13 +29,8 @@ def resize_image(original: Image.Image, max_width: int, max_height: int, graysca
     # Get the original dimensions of the image.
     original_width, original_height = original.size
     
-    # Calculate the scaling factor. The image is scaled by the smallest of the two ratios 
-    # (width and height) to ensure it fits within the provided dimensions.
-    scale = min(max_width / original_width, max_height / original_height)
-    
     # Calculate the new dimensions for the resized image.
-    height = int(original_height * scale)
-    width = int(original_width * scale)
+    width, height = target_size(original_width, original_height, max_width, max_height)
     
     # Check if the image is already the correct size and not needing grayscaling.
     if original_width == width and not grayscale:
@@ -1,6 +1,6 @@
 import unittest
 from PIL import Image
-from tiv_py.resize_image import resize_image
+from tiv_py.resize_image import resize_image, target_size
 
 class TestResizeImage(unittest.TestCase):
 
@@ -39,5 +39,9 @@ class TestResizeImage(unittest.TestCase):
         resized = resize_image(self.original, max_width, max_height, False)
         self.assertEqual(resized.size, (1000, 750))
 
+    def test_target_size(self):
+        self.assertEqual(target_size(800, 600, 320, 192), (256, 192))
+        self.assertEqual(target_size(600, 800, 320, 192), (144, 192))
+
 if __name__ == '__main__':
     unittest.main()
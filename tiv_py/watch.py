@@ -0,0 +1,85 @@
+# Derived from Stefan Haustein's TerminalImageViewer.java, available at:
+# https://github.com/stefanhaustein/TerminalImageViewer
+# License: Apache 2.0
+
+import os
+import sys
+import time
+import shutil
+from typing import BinaryIO, Optional
+from PIL import Image
+from Ansi import Ansi
+from BlockCache import BlockCache
+from CellGrid import CellGrid
+from ImageData import ImageData
+from is_url import is_url
+from load_image import load_image
+from resize_image import resize_image
+
+CLEAR_SCREEN = b"\x1b[2J\x1b[H"
+HIDE_CURSOR = b"\x1b[?25l"
+SHOW_CURSOR = b"\x1b[?25h"
+
+def source_stamp(name: str) -> Optional[tuple[int, int]]:
+    """
+    Returns the modification time and size of a local file, or None for URLs, which are reloaded on every poll.
+    """
+    if is_url(name):
+        return None
+    stat = os.stat(name)
+    return stat.st_mtime_ns, stat.st_size
+
+def watch(name: str, max_width: int, max_height: int, mode, grayscale: bool, interval: float = 1.0,
+          out: Optional[BinaryIO] = None, polls: Optional[int] = None):
+    """
+    Shows an image and keeps it up to date while its source is rewritten, polling it every interval seconds.
+    After the first full drawing, only the 4x8 pixel cells whose pixels changed are analyzed again and redrawn in place, so the work and the output per update scale with the size of the change.
+    Stops after polls polls if given, otherwise when interrupted.
+    The image is kept at least one row shorter than the terminal, so drawing it never scrolls the screen and the absolute cursor positions of the updates stay valid.
+    """
+
+    max_height = min(max_height, max(1, shutil.get_terminal_size().lines - 1) * 8)
+
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+
+    cache = BlockCache()
+    image_data = None
+    grid = None
+    stamp = None
+    out.write(HIDE_CURSOR)
+    try:
+        while polls is None or polls > 0:
+            updated = None
+            try:
+                current = source_stamp(name)
+                if grid is None or current is None or current != stamp:
+                    image = resize_image(load_image(name), max_width, max_height, grayscale)
+                    updated = ImageData.from_image(image)
+            except (OSError, ValueError, Image.DecompressionBombError):
+                # The source may be in the middle of being rewritten or replaced, keep the previous frame and try again on the next poll
+                pass
+
+            if updated is not None:
+                if grid is None or (updated.width, updated.height, updated.channels) != (image_data.width, image_data.height, image_data.channels):
+                    grid = CellGrid.from_image_data(updated, cache)
+                    out.write(CLEAR_SCREEN + grid.ansi(mode))
+                else:
+                    cells = grid.update(updated, image_data.data, cache)
+                    if cells:
+                        out.write(grid.ansi_cells(cells, mode) + Ansi.move_to(grid.height + 1, 1))
+                out.flush()
+                image_data = updated
+                stamp = current
+
+            if polls is not None:
+                polls -= 1
+                if not polls:
+                    break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write(SHOW_CURSOR)
+        out.flush()
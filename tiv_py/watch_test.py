@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+from PIL import Image
+from tiv_py.watch import watch, CLEAR_SCREEN, HIDE_CURSOR, SHOW_CURSOR
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.name = os.path.join(self.directory.name, 'chart.png')
+        Image.new('RGB', (32, 16), color = 'white').save(self.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rewrite(self, color, box):
+        image = Image.new('RGB', (32, 16), color = 'white')
+        image.paste(color, box)
+        image.save(self.name)
+        os.utime(self.name, ns=(os.stat(self.name).st_mtime_ns + 10**9,) * 2)
+
+    @patch('tiv_py.watch.time.sleep')
+    def test_watch_redraws_changed_cells(self, mock_sleep):
+        # Between the polls a monitoring job repaints the cell at column 3, row 2
+        mock_sleep.side_effect = lambda interval: self.rewrite('red', (8, 8, 12, 16)) if mock_sleep.call_count == 1 else None
+        out = BytesIO()
+
+        watch(self.name, 32, 16, '256', False, 0.1, out, polls=3)
+
+        output = out.getvalue()
+        self.assertTrue(output.startswith(HIDE_CURSOR + CLEAR_SCREEN))
+        self.assertTrue(output.endswith(SHOW_CURSOR))
+        self.assertEqual(output.count(CLEAR_SCREEN), 1)
+
+        # The update moves to the changed cell, redraws it and parks the cursor below the image
+        update = output[output.rindex(b'\x1b[0m\n') + 5:-len(SHOW_CURSOR)]
+        self.assertEqual(update, b'\x1b[2;3H\x1b[38;5;16m\x1b[48;5;196m\xc2\xa0\x1b[0m\x1b[3;1H')
+
+    @patch('tiv_py.watch.time.sleep')
+    def test_watch_source_replaced(self, mock_sleep):
+        # The source is deleted after the first poll and written again with a change after the second
+        def replace(interval):
+            if mock_sleep.call_count == 1:
+                os.remove(self.name)
+            elif mock_sleep.call_count == 2:
+                self.rewrite('red', (8, 8, 12, 16))
+        mock_sleep.side_effect = replace
+        out = BytesIO()
+
+        watch(self.name, 32, 16, '256', False, 0.1, out, polls=3)
+
+        output = out.getvalue()
+        self.assertEqual(output.count(CLEAR_SCREEN), 1)
+        update = output[output.rindex(b'\x1b[0m\n') + 5:-len(SHOW_CURSOR)]
+        self.assertEqual(update, b'\x1b[2;3H\x1b[38;5;16m\x1b[48;5;196m\xc2\xa0\x1b[0m\x1b[3;1H')
+
+    @patch('tiv_py.watch.shutil.get_terminal_size', return_value=os.terminal_size((80, 2)))
+    @patch('tiv_py.watch.time.sleep')
+    def test_watch_fits_terminal(self, mock_sleep, mock_get_terminal_size):
+        # A two row terminal leaves one row for the image and one for the cursor below it
+        mock_sleep.side_effect = lambda interval: self.rewrite('red', (0, 0, 4, 16)) if mock_sleep.call_count == 1 else None
+        out = BytesIO()
+
+        watch(self.name, 32, 16, '256', False, 0.1, out, polls=3)
+
+        output = out.getvalue()
+        frame = output[len(HIDE_CURSOR + CLEAR_SCREEN):output.index(b'\x1b[0m\n') + 5]
+        self.assertEqual(frame.count(b'\n'), 1)
+
+        # The update redraws the first row and parks the cursor on the second, the last row of the terminal
+        update = output[len(HIDE_CURSOR + CLEAR_SCREEN) + len(frame):-len(SHOW_CURSOR)]
+        self.assertTrue(update.startswith(b'\x1b[1;1H'))
+        self.assertTrue(update.endswith(b'\x1b[0m\x1b[2;1H'))
+
+    @patch('tiv_py.watch.time.sleep')
+    def test_watch_unchanged(self, mock_sleep):
+        out = BytesIO()
+        watch(self.name, 32, 16, '256', False, 0.1, out, polls=3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(out.getvalue().count(b'H'), 1)
+
+    @patch('tiv_py.watch.time.sleep', side_effect=KeyboardInterrupt)
+    def test_watch_interrupted(self, mock_sleep):
+        out = BytesIO()
+        watch(self.name, 32, 16, '256', False, 0.1, out)
+        self.assertTrue(out.getvalue().endswith(SHOW_CURSOR))
+
+if __name__ == '__main__':
+    unittest.main()